@@ -2,28 +2,85 @@
 Data Caching Mechanism
 
 This module handles caching CPI data locally to minimize API calls to Statistics Canada.
-Cached data is stored in the Data/ directory and validated based on file age.
+Cached data is stored in the per-user cache directory (override with the
+STATSCAN_CACHE_DIR environment variable) and validated based on file age.
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import os
+import sys
+import json
+import hashlib
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _default_cache_dir() -> Path:
+    """
+    Resolve the cache directory.
+
+    Uses STATSCAN_CACHE_DIR if set, otherwise the platform's per-user cache
+    location (%LOCALAPPDATA%, ~/Library/Caches, or $XDG_CACHE_HOME / ~/.cache).
+
+    Returns:
+        Path to the cache directory (may not exist yet)
+    """
+    override = os.environ.get("STATSCAN_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+    return Path(base) / "statscan_inflation"
+
+
 # Cache configuration
-CACHE_DIR = Path(__file__).parent.parent.parent / "Data"
+CACHE_DIR = _default_cache_dir()
 CACHE_FILE = CACHE_DIR / "cpi_data_cache.parquet"
+CACHE_META = CACHE_DIR / "cpi_data_cache.meta.json"  # Upstream ETag/Last-Modified
+CACHE_ZIP_HASH = CACHE_DIR / ".last_zip_hash"  # Digest of the ZIP the cache was built from
 CACHE_MAX_AGE_DAYS = 1  # Refresh if older than 1 day
 
+# Previous repo-relative cache location, still read if nothing newer exists
+LEGACY_CACHE_FILE = Path(__file__).parent.parent.parent / "Data" / "cpi_data_cache.parquet"
+
 
 def ensure_cache_dir():
     """Create cache directory if it doesn't exist."""
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _stat_cache_file() -> Tuple[Path, Optional[os.stat_result]]:
+    """
+    Locate and stat the cache file.
+
+    Falls back to the legacy Data/ location (read-only) when the user cache
+    has not been written yet. The stat is repeated on every call (it costs
+    microseconds) so rewrites by other worker processes are seen.
+
+    Returns:
+        Tuple of (path to read from, stat result or None if no cache exists)
+    """
+    for path in (CACHE_FILE, LEGACY_CACHE_FILE):
+        try:
+            return path, path.stat()
+        except OSError:
+            continue
+
+    return CACHE_FILE, None
+
+
 def is_cache_valid() -> bool:
     """
     Check if cached data exists and is recent enough.
@@ -31,12 +88,13 @@ def is_cache_valid() -> bool:
     Returns:
         True if cache exists and is valid (not too old), False otherwise
     """
-    if not CACHE_FILE.exists():
+    _, stat = _stat_cache_file()
+    if stat is None:
         logger.info("No cache file found")
         return False
 
     # Check file age
-    file_mtime = datetime.fromtimestamp(CACHE_FILE.stat().st_mtime)
+    file_mtime = datetime.fromtimestamp(stat.st_mtime)
     age = datetime.now() - file_mtime
 
     if age > timedelta(days=CACHE_MAX_AGE_DAYS):
@@ -47,40 +105,108 @@ def is_cache_valid() -> bool:
     return True
 
 
-def save_to_cache(df: pd.DataFrame):
+def save_to_cache(df: pd.DataFrame) -> bool:
     """
     Save DataFrame to cache.
 
     Args:
         df: CPI DataFrame to cache
-    """
-    ensure_cache_dir()
 
+    Returns:
+        True if the cache file was written, False otherwise
+    """
     try:
-        # Save as parquet for efficient storage and fast loading
-        df.to_parquet(CACHE_FILE, index=False)
+        ensure_cache_dir()
+
+        # Dictionary-encode the repeated category names and store values as float32
+        df = df.assign(
+            category=df['category'].astype('category'),
+            value=df['value'].astype('float32')
+        )
+
+        # Save as zstd-compressed parquet for efficient storage and fast loading
+        df.to_parquet(
+            CACHE_FILE,
+            engine='pyarrow',
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=True,
+            index=False
+        )
         logger.info(f"Saved {len(df)} rows to cache: {CACHE_FILE}")
+        return True
     except Exception as e:
         logger.error(f"Failed to save cache: {e}")
         # Don't raise - caching failure shouldn't break the app
+        return False
 
 
-def load_from_cache() -> pd.DataFrame:
+def _cache_filter(
+    schema: pa.Schema,
+    categories: Optional[List[str]],
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> Optional[pc.Expression]:
+    """Build a pyarrow predicate for the requested categories and date range."""
+    conditions = []
+    if categories is not None:
+        conditions.append(pc.field('category').isin(pa.array(list(categories), type=pa.string())))
+
+    date_type = schema.field('date').type
+    if start_date:
+        conditions.append(pc.field('date') >= pa.scalar(pd.Timestamp(start_date), type=date_type))
+    if end_date:
+        conditions.append(pc.field('date') <= pa.scalar(pd.Timestamp(end_date), type=date_type))
+
+    if not conditions:
+        return None
+
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def load_from_cache(
+    categories: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> pd.DataFrame:
     """
-    Load DataFrame from cache.
+    Load DataFrame from cache, optionally only a slice of it.
+
+    Category and date filters are pushed down to the parquet scan, so only
+    the selected rows are decoded into pandas.
+
+    Args:
+        categories: Categories to include, None for all
+        start_date: Inclusive start date (YYYY-MM-DD), None for no limit
+        end_date: Inclusive end date (YYYY-MM-DD), None for no limit
 
     Returns:
-        Cached CPI DataFrame
+        Cached CPI DataFrame (category as pandas categorical, value as float32)
 
     Raises:
         FileNotFoundError: If cache file doesn't exist
         Exception: If loading fails
     """
-    if not CACHE_FILE.exists():
-        raise FileNotFoundError(f"Cache file not found: {CACHE_FILE}")
+    cache_file, stat = _stat_cache_file()
+    if stat is None:
+        raise FileNotFoundError(f"Cache file not found: {cache_file}")
 
     try:
-        df = pd.read_parquet(CACHE_FILE)
+        if categories is None and not start_date and not end_date:
+            # The pandas metadata written by save_to_cache restores the categorical dtype
+            df = pd.read_parquet(cache_file, engine='pyarrow')
+        else:
+            dataset = ds.dataset(cache_file, format='parquet')
+            table = dataset.to_table(
+                filter=_cache_filter(dataset.schema, categories, start_date, end_date)
+            )
+            df = table.to_pandas()
+            if isinstance(df['category'].dtype, pd.CategoricalDtype):
+                df['category'] = df['category'].cat.remove_unused_categories()
+
         logger.info(f"Loaded {len(df)} rows from cache")
         return df
     except Exception as e:
@@ -88,6 +214,44 @@ def load_from_cache() -> pd.DataFrame:
         raise
 
 
+def load_cache_meta() -> dict:
+    """
+    Load the upstream validators recorded alongside the cache.
+
+    Returns:
+        Dictionary with 'etag', 'last_modified' and 'fetched_at' keys,
+        or an empty dict if no metadata is available
+    """
+    if not CACHE_META.exists():
+        return {}
+
+    try:
+        return json.loads(CACHE_META.read_text())
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache metadata: {e}")
+        return {}
+
+
+def save_cache_meta(validators: dict):
+    """
+    Record upstream validators for the cached data.
+
+    Args:
+        validators: Dictionary with 'etag' and 'last_modified' from the download
+    """
+    meta = {
+        "etag": validators.get("etag"),
+        "last_modified": validators.get("last_modified"),
+        "fetched_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    try:
+        ensure_cache_dir()
+        CACHE_META.write_text(json.dumps(meta))
+    except Exception as e:
+        logger.error(f"Failed to save cache metadata: {e}")
+
+
 def get_cache_info() -> dict:
     """
     Get information about the cached data.
@@ -100,13 +264,13 @@ def get_cache_info() -> dict:
             - last_modified: datetime (if exists)
             - age_hours: float (if exists)
     """
+    cache_file, stat = _stat_cache_file()
     info = {
-        "exists": CACHE_FILE.exists(),
-        "path": str(CACHE_FILE),
+        "exists": stat is not None,
+        "path": str(cache_file),
     }
 
     if info["exists"]:
-        stat = CACHE_FILE.stat()
         info["size_mb"] = stat.st_size / (1024 * 1024)
         info["last_modified"] = datetime.fromtimestamp(stat.st_mtime)
         info["age_hours"] = (datetime.now() - info["last_modified"]).total_seconds() / 3600
@@ -114,10 +278,22 @@ def get_cache_info() -> dict:
     return info
 
 
+def _zip_digest(zip_data: bytes) -> str:
+    """Hash downloaded ZIP bytes for comparison with the cached copy."""
+    return hashlib.blake2b(zip_data, digest_size=16).hexdigest()
+
+
 def clear_cache():
     """
-    Delete the cache file.
+    Delete the cache file and its metadata.
     """
+    for sidecar in (CACHE_META, CACHE_ZIP_HASH):
+        if sidecar.exists():
+            try:
+                sidecar.unlink()
+            except Exception as e:
+                logger.error(f"Failed to clear cache metadata: {e}")
+
     if CACHE_FILE.exists():
         try:
             CACHE_FILE.unlink()
@@ -128,6 +304,85 @@ def clear_cache():
         logger.info("No cache to clear")
 
 
+def _reuse_cache() -> Optional[pd.DataFrame]:
+    """
+    Load the existing cache and extend its validity.
+
+    Returns:
+        Cached CPI DataFrame, or None if the cache could not be read
+    """
+    try:
+        df = load_from_cache()
+        CACHE_FILE.touch()
+        return df
+    except Exception as e:
+        logger.warning(f"Could not reuse cache: {e}")
+        return None
+
+
+def _download_to_cache(conditional: bool = True) -> pd.DataFrame:
+    """
+    Download fresh data and store it in the cache.
+
+    If a cache file exists, the download is conditional on the recorded
+    ETag/Last-Modified. When Statistics Canada reports the table unchanged,
+    the existing cache is reused and its timestamp extended instead of
+    re-downloading and re-parsing the full ZIP. If the server sends the
+    table anyway, a digest of the ZIP is compared with the one the cache
+    was built from, so byte-identical republications skip the parse too.
+
+    Args:
+        conditional: If False, skip both shortcuts and always parse the
+            downloaded ZIP (e.g. to replace a bad or outdated cache)
+
+    Returns:
+        CPI DataFrame
+    """
+    from .loader import download_statscan_cpi_data, parse_statscan_zip, NotModified
+
+    cache_file, stat = _stat_cache_file()
+    have_cache = conditional and cache_file == CACHE_FILE and stat is not None
+    meta = load_cache_meta() if have_cache else {}
+
+    try:
+        zip_data, validators = download_statscan_cpi_data(
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified")
+        )
+    except NotModified:
+        df = _reuse_cache()
+        if df is not None:
+            logger.info("Upstream unchanged, cache validity extended")
+            return df
+        logger.warning("Cache unreadable after 304, downloading unconditionally")
+        have_cache = False
+        zip_data, validators = download_statscan_cpi_data()
+
+    digest = _zip_digest(zip_data)
+    if have_cache and CACHE_ZIP_HASH.exists():
+        try:
+            same_zip = CACHE_ZIP_HASH.read_text().strip() == digest
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable ZIP hash: {e}")
+            same_zip = False
+
+        if same_zip:
+            df = _reuse_cache()
+            if df is not None:
+                save_cache_meta(validators)
+                logger.info("Downloaded ZIP identical to cached data, skipped parsing")
+                return df
+
+    df = parse_statscan_zip(zip_data)
+    if save_to_cache(df):
+        save_cache_meta(validators)
+        try:
+            CACHE_ZIP_HASH.write_text(digest)
+        except Exception as e:
+            logger.error(f"Failed to save ZIP hash: {e}")
+    return df
+
+
 def get_cached_or_download(force_refresh: bool = False) -> pd.DataFrame:
     """
     Get CPI data from cache or download if cache is invalid/missing.
@@ -141,13 +396,9 @@ def get_cached_or_download(force_refresh: bool = False) -> pd.DataFrame:
     Returns:
         CPI DataFrame
     """
-    from .loader import load_cpi_data
-
     if force_refresh:
         logger.info("Force refresh requested, downloading fresh data")
-        df = load_cpi_data()
-        save_to_cache(df)
-        return df
+        return _download_to_cache(conditional=False)
 
     if is_cache_valid():
         try:
@@ -158,6 +409,4 @@ def get_cached_or_download(force_refresh: bool = False) -> pd.DataFrame:
 
     # Cache invalid or load failed, download fresh data
     logger.info("Downloading fresh CPI data")
-    df = load_cpi_data()
-    save_to_cache(df)
-    return df
+    return _download_to_cache()
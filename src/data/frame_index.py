@@ -0,0 +1,284 @@
+"""
+Category/Date Row Index
+
+This module builds lookup structures over a long-format CPI DataFrame so that
+selecting a category, a date range or a single month touches only the matching
+rows instead of scanning the whole frame with a boolean mask.
+
+Indexes are built once per DataFrame object and cached for its lifetime.
+"""
+
+import pandas as pd
+import numpy as np
+import weakref
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+
+class FrameCache:
+    """
+    Cache of derived values keyed by DataFrame identity.
+
+    Entries are dropped when the DataFrame is garbage collected, and ignored
+    if the frame's length no longer matches the one recorded when cached.
+    Code that reorders or edits a frame in place keeps its identity and length,
+    so it must call discard_frame() afterwards.
+    """
+
+    # Every cache created, so discard_frame() can reach all of them
+    _instances = weakref.WeakSet()
+
+    def __init__(self):
+        self._entries = {}
+        FrameCache._instances.add(self)
+
+    def get(self, df: pd.DataFrame) -> Optional[Any]:
+        """Return the cached value for df, or None if there is none."""
+        entry = self._entries.get(id(df))
+        if entry is None:
+            return None
+
+        ref, length, value = entry
+        if ref() is not df or length != len(df):
+            return None
+        return value
+
+    def set(self, df: pd.DataFrame, value: Any) -> Any:
+        """Cache value for df and return it."""
+        key = id(df)
+        if key not in self._entries:
+            weakref.finalize(df, self._entries.pop, key, None)
+        self._entries[key] = (weakref.ref(df), len(df), value)
+        return value
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    def discard(self, df: pd.DataFrame):
+        """Drop the cached entry for df, if any."""
+        self._entries.pop(id(df), None)
+
+
+def discard_frame(df: pd.DataFrame):
+    """Drop df's entries from every FrameCache, e.g. after sorting it in place."""
+    for cache in list(FrameCache._instances):
+        cache.discard(df)
+
+
+@lru_cache(maxsize=256)
+def _parse_date(value) -> np.datetime64:
+    """Parse a date-like value once; the same few filter dates recur across calls."""
+    return pd.Timestamp(value).to_datetime64()
+
+
+def _as_datetime64(value, dtype: np.dtype) -> np.datetime64:
+    """Convert a date-like value to a numpy datetime64 matching the date column."""
+    return _parse_date(value).astype(dtype)
+
+
+class FrameIndex:
+    """
+    Row positions of a CPI DataFrame grouped by category and ordered by date.
+
+    Attributes:
+        categories: Category names in sorted order
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        dates = df['date'].to_numpy()
+        codes, uniques = pd.factorize(df['category'], sort=True)
+
+        # Positions ordered by (category, date); missing categories (-1) are left out
+        order = np.lexsort((dates, codes))
+        order = order[codes[order] >= 0]
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+
+        self.categories = [str(cat) for cat in uniques]
+        self._cat_rows = {
+            cat: order[bounds[i]:bounds[i + 1]]
+            for i, cat in enumerate(self.categories)
+        }
+
+        # Positions ordered by date for range and snapshot lookups
+        self._dates = dates
+        self._date_order = np.argsort(dates, kind='stable')
+        self._sorted_dates = dates[self._date_order]
+        self._months = None
+
+    def cat_rows(self, category: str) -> np.ndarray:
+        """
+        Get row positions for one category, ordered by date.
+
+        Args:
+            category: Category name
+
+        Returns:
+            Integer array of row positions (empty if the category is absent)
+        """
+        return self._cat_rows.get(category, np.empty(0, dtype=np.intp))
+
+    def _date_bounds(self, sorted_dates: np.ndarray, start, end) -> tuple:
+        """Locate an inclusive [start, end] date range in a sorted date array."""
+        lo = 0
+        hi = len(sorted_dates)
+        if start is not None:
+            lo = np.searchsorted(sorted_dates, _as_datetime64(start, sorted_dates.dtype), side='left')
+        if end is not None:
+            hi = np.searchsorted(sorted_dates, _as_datetime64(end, sorted_dates.dtype), side='right')
+        return lo, max(lo, hi)
+
+    @property
+    def last_date(self) -> pd.Timestamp:
+        """Most recent date in the frame (NaT if the frame is empty)."""
+        if len(self._sorted_dates) == 0:
+            return pd.NaT
+        return pd.Timestamp(self._sorted_dates[-1])
+
+    @property
+    def months(self) -> np.ndarray:
+        """Distinct dates in the frame, ascending (computed on first use)."""
+        if self._months is None:
+            sorted_dates = self._sorted_dates
+            is_first = np.empty(len(sorted_dates), dtype=bool)
+            is_first[:1] = True
+            np.not_equal(sorted_dates[1:], sorted_dates[:-1], out=is_first[1:])
+            self._months = sorted_dates[is_first]
+        return self._months
+
+    def date_rows(self, start=None, end=None) -> np.ndarray:
+        """
+        Get row positions with start <= date <= end, ordered by date.
+
+        Args:
+            start: Inclusive start date, None for no limit
+            end: Inclusive end date, None for no limit
+
+        Returns:
+            Integer array of row positions
+        """
+        lo, hi = self._date_bounds(self._sorted_dates, start, end)
+        return self._date_order[lo:hi]
+
+    def rows(
+        self,
+        categories: Optional[Iterable[str]] = None,
+        start=None,
+        end=None
+    ) -> np.ndarray:
+        """
+        Get row positions for categories within a date range.
+
+        Rows are ordered by category (sorted) then date, matching
+        sort_values(['category', 'date']).
+
+        Args:
+            categories: Categories to include, None for all
+            start: Inclusive start date, None for no limit
+            end: Inclusive end date, None for no limit
+
+        Returns:
+            Integer array of row positions
+        """
+        if categories is None:
+            selected = self.categories
+        else:
+            wanted = set(categories)
+            selected = [cat for cat in self.categories if cat in wanted]
+
+        # Convert the bounds once rather than once per category
+        if start is not None:
+            start = _as_datetime64(start, self._dates.dtype)
+        if end is not None:
+            end = _as_datetime64(end, self._dates.dtype)
+
+        parts = []
+        for cat in selected:
+            positions = self._cat_rows[cat]
+            if start is not None or end is not None:
+                lo, hi = self._date_bounds(self._dates[positions], start, end)
+                positions = positions[lo:hi]
+            parts.append(positions)
+
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(parts)
+
+
+def take_rows(df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """
+    Select rows by position, slicing instead of gathering when possible.
+
+    A run of consecutive ascending positions (e.g. one category of a frame
+    sorted by category and date) becomes a plain slice, which pandas serves
+    without copying the column data.
+
+    Args:
+        df: DataFrame to select from
+        rows: Integer row positions
+
+    Returns:
+        Selected rows
+    """
+    # Cheap span check first, then confirm every step is +1
+    if len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows) and np.all(np.diff(rows) == 1):
+        return df.iloc[rows[0]:rows[-1] + 1]
+    return df.iloc[rows]
+
+
+_index_cache = FrameCache()
+
+
+def get_frame_index(df: pd.DataFrame) -> FrameIndex:
+    """
+    Get the FrameIndex for a DataFrame, building it on first use.
+
+    Args:
+        df: CPI DataFrame with 'date' and 'category' columns
+
+    Returns:
+        FrameIndex for df
+    """
+    index = _index_cache.get(df)
+    if index is None:
+        index = _index_cache.set(df, FrameIndex(df))
+    return index
+
+
+def peek_frame_index(df: pd.DataFrame) -> Optional[FrameIndex]:
+    """
+    Get the FrameIndex for a DataFrame only if it has already been built.
+
+    One-off filters use the index when some other caller has paid for it,
+    and a boolean mask otherwise, which is cheaper than building the index
+    for a single lookup.
+
+    Args:
+        df: CPI DataFrame with 'date' and 'category' columns
+
+    Returns:
+        Cached FrameIndex for df, or None
+    """
+    return _index_cache.get(df)
+
+
+def date_mask(dates: pd.Series, start=None, end=None) -> np.ndarray:
+    """
+    Boolean mask of start <= date <= end, for frames without a cached index.
+
+    Args:
+        dates: Date column
+        start: Inclusive start date, None for no limit
+        end: Inclusive end date, None for no limit
+
+    Returns:
+        Boolean array aligned with dates
+    """
+    values = dates.to_numpy()
+    mask = np.ones(len(values), dtype=bool)
+    if start is not None:
+        mask &= values >= _as_datetime64(start, values.dtype)
+    if end is not None:
+        mask &= values <= _as_datetime64(end, values.dtype)
+    return mask
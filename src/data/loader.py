@@ -7,10 +7,15 @@ from Statistics Canada Table 18-10-0004-01.
 
 import requests
 import pandas as pd
+import numpy as np
 import io
 import logging
+import re
 import zipfile
-from typing import Optional
+from typing import IO, Optional, Tuple, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .frame_index import date_mask, peek_frame_index, take_rows
 
 logger = logging.getLogger(__name__)
 
@@ -19,60 +24,161 @@ logger = logging.getLogger(__name__)
 STATSCAN_TABLE_ID = "18100004"
 STATSCAN_CSV_URL = f"https://www150.statcan.gc.ca/n1/tbl/csv/{STATSCAN_TABLE_ID}-eng.zip"
 
+# Columns read from the CSV; the remaining metadata columns are skipped by the parser
+STATSCAN_COLUMNS = ['REF_DATE', 'GEO', 'Products and product groups', 'VALUE']
 
-def download_statscan_cpi_data() -> bytes:
+# Categories on a pre-2002 base year, e.g. "Food (1992=100)"
+DEPRECATED_BASE_PATTERN = re.compile(r'\(19\d{2}=100\)')
+
+# Download tuning
+DOWNLOAD_TIMEOUT = 30  # seconds
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes per streamed read
+
+
+def _create_session() -> requests.Session:
+    """
+    Create a pooled HTTP session for Statistics Canada downloads.
+
+    Reusing one session keeps the TCP/TLS connection alive between requests,
+    so refreshes and retries skip the handshake. Transient gateway errors
+    are retried with exponential backoff.
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": "StatsCanInflation/1.0",
+        "Accept-Encoding": "gzip, deflate",
+    })
+    return session
+
+
+# Module-level session shared by all downloads in this process
+_SESSION = _create_session()
+
+
+class NotModified(Exception):
+    """Raised when Statistics Canada reports the table unchanged (HTTP 304)."""
+
+
+def download_statscan_cpi_data(
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None
+) -> Tuple[bytes, dict]:
     """
     Download the latest CPI data from Statistics Canada website.
 
     The data comes as a ZIP file containing a CSV. This function downloads
-    the ZIP and extracts the CSV file.
+    the ZIP; use parse_statscan_zip() to read the CSV straight out of it.
+
+    When validators from a previous download are supplied, the request is
+    made conditional so an unchanged table costs a single round-trip.
+
+    Args:
+        etag: ETag from the previous download, if known
+        last_modified: Last-Modified header from the previous download, if known
 
     Returns:
-        bytes: Raw CSV data
+        Tuple of (raw ZIP bytes, validators dict with 'etag' and 'last_modified')
 
     Raises:
+        NotModified: If the server reports the table unchanged since the validators
         requests.RequestException: If download fails
-        Exception: If ZIP extraction fails
     """
     logger.info("Downloading CPI data from Statistics Canada...")
 
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
     try:
-        # Download the ZIP file
-        response = requests.get(STATSCAN_CSV_URL, timeout=30)
-        response.raise_for_status()
+        # Stream the ZIP file into a buffer over the pooled connection
+        buffer = io.BytesIO()
+        with _SESSION.get(
+            STATSCAN_CSV_URL,
+            headers=headers,
+            timeout=DOWNLOAD_TIMEOUT,
+            stream=True
+        ) as response:
+            if response.status_code == 304:
+                logger.info("Statistics Canada data not modified since last download")
+                raise NotModified(STATSCAN_CSV_URL)
+
+            response.raise_for_status()
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+
+        logger.info(f"Successfully downloaded ZIP file ({buffer.tell()} bytes)")
+        return buffer.getvalue(), validators
 
-        logger.info("Successfully downloaded ZIP file")
+    except requests.RequestException as e:
+        logger.error(f"Failed to download CPI data: {e}")
+        raise
 
-        # Extract CSV from ZIP
-        with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
-            # Get list of files in ZIP
-            file_list = zip_file.namelist()
-            logger.info(f"Files in ZIP: {file_list}")
 
-            # Find the CSV file (should be 18100004.csv, not the metadata file)
-            csv_filename = None
-            for filename in file_list:
-                if filename.endswith('.csv') and 'MetaData' not in filename:
-                    csv_filename = filename
-                    break
+def _find_csv_member(zip_file: zipfile.ZipFile) -> str:
+    """
+    Find the data CSV inside a Statistics Canada ZIP.
 
-            if not csv_filename:
-                raise ValueError(f"Could not find CSV file in ZIP. Files: {file_list}")
+    Args:
+        zip_file: Open ZIP archive
 
-            # Extract and return CSV content
-            csv_data = zip_file.read(csv_filename)
-            logger.info(f"Extracted {csv_filename} from ZIP ({len(csv_data)} bytes)")
-            return csv_data
+    Returns:
+        Name of the data CSV (e.g. 18100004.csv, not the metadata file)
 
-    except requests.RequestException as e:
-        logger.error(f"Failed to download CPI data: {e}")
-        raise
+    Raises:
+        ValueError: If no data CSV is present
+    """
+    file_list = zip_file.namelist()
+    logger.info(f"Files in ZIP: {file_list}")
+
+    for filename in file_list:
+        if filename.endswith('.csv') and 'MetaData' not in filename:
+            return filename
+
+    raise ValueError(f"Could not find CSV file in ZIP. Files: {file_list}")
+
+
+def parse_statscan_zip(zip_data: bytes) -> pd.DataFrame:
+    """
+    Parse the CPI CSV directly out of a Statistics Canada ZIP.
+
+    The CSV member is handed to pandas as a file handle, so the
+    decompressed CSV is never materialized as a separate bytes object.
+
+    Args:
+        zip_data: Raw ZIP bytes
+
+    Returns:
+        pandas DataFrame in the format returned by parse_statscan_csv()
+
+    Raises:
+        Exception: If ZIP extraction or parsing fails
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(zip_data)) as zip_file:
+            csv_filename = _find_csv_member(zip_file)
+            with zip_file.open(csv_filename) as csv_file:
+                return parse_statscan_csv(csv_file)
     except Exception as e:
         logger.error(f"Failed to extract CSV from ZIP: {e}")
         raise
 
 
-def parse_statscan_csv(csv_data: bytes) -> pd.DataFrame:
+def parse_statscan_csv(csv_data: Union[bytes, IO[bytes]]) -> pd.DataFrame:
     """
     Parse Statistics Canada CSV data format.
 
@@ -81,46 +187,64 @@ def parse_statscan_csv(csv_data: bytes) -> pd.DataFrame:
     - GEO: Geography (we filter to "Canada")
     - Products and product groups: Category name
     - VALUE: CPI value
-    - Other metadata columns
+    - Other metadata columns (not read)
 
     Args:
-        csv_data: Raw CSV bytes
+        csv_data: Raw CSV bytes or a binary file handle
 
     Returns:
         pandas DataFrame with parsed CPI data in long format:
             - date: Date column (datetime)
-            - category: CPI category name
-            - value: CPI value (float, base 2002=100)
+            - category: CPI category name (categorical)
+            - value: CPI value (float32, base 2002=100)
     """
     logger.info("Parsing CPI CSV data...")
 
-    # Read CSV, handling UTF-8 BOM
-    df = pd.read_csv(io.BytesIO(csv_data), encoding='utf-8-sig', low_memory=False)
+    if isinstance(csv_data, bytes):
+        csv_data = io.BytesIO(csv_data)
 
-    logger.info(f"Loaded CSV with {len(df)} rows and {len(df.columns)} columns")
-    logger.info(f"Columns: {df.columns.tolist()}")
+    # Read only the columns we use, handling UTF-8 BOM. The repeated
+    # geography and category names are built as categoricals by the parser.
+    df = pd.read_csv(
+        csv_data,
+        encoding='utf-8-sig',
+        usecols=STATSCAN_COLUMNS,
+        dtype={'GEO': 'category', 'Products and product groups': 'category'},
+        engine='c',
+        low_memory=False
+    )
 
-    # Filter to Canada only
-    df = df[df['GEO'] == 'Canada'].copy()
+    logger.info(f"Loaded CSV with {len(df)} rows")
 
-    # Select and rename relevant columns
-    df = df[['REF_DATE', 'Products and product groups', 'VALUE']].copy()
+    # Filter to Canada only, selecting the relevant columns in one step
+    df = df.loc[df['GEO'] == 'Canada', ['REF_DATE', 'Products and product groups', 'VALUE']]
     df.columns = ['date', 'category', 'value']
 
-    # Convert date from YYYY-MM to datetime
-    df['date'] = pd.to_datetime(df['date'], format='%Y-%m')
-
-    # Convert value to numeric
-    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    # Convert date from YYYY-MM to datetime, parsing each distinct month only once,
+    # and value to numeric (float32 is ample for one-decimal index values)
+    codes, months = pd.factorize(df['date'])
+    parsed = pd.to_datetime(months, format='%Y-%m')
+    df = df.assign(
+        date=parsed.take(codes, allow_fill=True, fill_value=pd.NaT).to_numpy(),
+        value=pd.to_numeric(df['value'], errors='coerce').astype('float32')
+    )
 
     # Remove rows with missing values
     df = df.dropna()
 
     # Filter to only keep base 2002=100 data (remove deprecated indices)
-    # Categories ending with "(1992=100)" or other base years should be excluded
-    df = df[~df['category'].str.contains(r'\(19\d{2}=100\)', na=False, regex=True)]
-
-    # Sort by category and date
+    # Categories ending with "(1992=100)" or other base years should be excluded.
+    # The regex runs once per distinct name rather than once per row.
+    deprecated = [
+        category for category in df['category'].cat.categories
+        if DEPRECATED_BASE_PATTERN.search(category)
+    ]
+    df = df[~df['category'].isin(deprecated)]
+
+    # Drop names that only occurred outside Canada or on an old base year
+    df = df.assign(category=df['category'].cat.remove_unused_categories())
+
+    # Sort by category and date so later steps can skip re-sorting
     df = df.sort_values(['category', 'date']).reset_index(drop=True)
 
     logger.info(f"Parsed {len(df)} data points across {df['category'].nunique()} categories")
@@ -140,8 +264,8 @@ def load_cpi_data() -> pd.DataFrame:
         Exception: If download or parsing fails
     """
     try:
-        csv_data = download_statscan_cpi_data()
-        df = parse_statscan_csv(csv_data)
+        zip_data, _ = download_statscan_cpi_data()
+        df = parse_statscan_zip(zip_data)
         return df
     except Exception as e:
         logger.error(f"Failed to load CPI data: {e}")
@@ -172,7 +296,15 @@ def filter_by_category(df: pd.DataFrame, categories: list) -> pd.DataFrame:
     Returns:
         Filtered DataFrame
     """
-    return df[df['category'].isin(categories)].copy()
+    index = peek_frame_index(df)
+    if index is None:
+        return df[df['category'].isin(categories)]
+
+    # Keep the original row order (index order already matches it for sorted frames)
+    rows = np.sort(index.rows(categories))
+
+    # Contiguous category blocks come back as slices rather than copies
+    return take_rows(df, rows)
 
 
 def filter_by_date_range(
@@ -191,14 +323,10 @@ def filter_by_date_range(
     Returns:
         Filtered DataFrame
     """
-    result = df.copy()
-
-    if start_date:
-        start = pd.to_datetime(start_date)
-        result = result[result['date'] >= start]
-
-    if end_date:
-        end = pd.to_datetime(end_date)
-        result = result[result['date'] <= end]
+    index = peek_frame_index(df)
+    if index is None:
+        return df[date_mask(df['date'], start_date or None, end_date or None)]
 
-    return result
+    # Keep the original row order
+    rows = np.sort(index.date_rows(start_date or None, end_date or None))
+    return take_rows(df, rows)
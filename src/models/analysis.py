@@ -12,7 +12,17 @@ import pandas as pd
 import numpy as np
 from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
-from .inflation import add_all_inflation_metrics
+from .inflation import ensure_inflation_metrics
+from ..data.frame_index import FrameCache, get_frame_index, take_rows
+
+# Per-date breakdown snapshots, per metrics frame
+_breakdown_cache = FrameCache()
+
+# Sorted YoY snapshots used by the percentile functions, per frame and date
+_percentile_cache = FrameCache()
+
+# Full category x month pivots per value column, per metrics frame
+_wide_cache = FrameCache()
 
 
 def get_recent_trends(
@@ -32,15 +42,12 @@ def get_recent_trends(
         DataFrame with recent data and inflation metrics
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
 
     # Calculate cutoff date
     max_date = df['date'].max()
     cutoff_date = max_date - pd.DateOffset(months=months)
 
-    # Filter to recent period
-    recent = df[df['date'] >= cutoff_date].copy()
-
     # Filter to specified categories or defaults
     if categories is None:
         categories = [
@@ -51,14 +58,17 @@ def get_recent_trends(
             "Gasoline",
         ]
 
-    recent = recent[recent['category'].isin(categories)]
+    # Select recent rows per category, already ordered by category and date
+    rows = get_frame_index(df).rows(categories, start=cutoff_date)
 
-    return recent.sort_values(['category', 'date'])
+    return take_rows(df, rows)
 
 
 def get_historical_comparison(
     df: pd.DataFrame,
-    categories: Optional[List[str]] = None
+    categories: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Get full historical data for comparison (2008-present).
@@ -66,12 +76,14 @@ def get_historical_comparison(
     Args:
         df: CPI DataFrame
         categories: Optional list of categories (default: key categories)
+        start_date: Optional start date (YYYY-MM-DD), None for all data
+        end_date: Optional end date (YYYY-MM-DD), None for all data
 
     Returns:
         DataFrame with historical data and inflation metrics
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
 
     # Filter to specified categories or defaults
     if categories is None:
@@ -82,9 +94,10 @@ def get_historical_comparison(
             "Transportation",
         ]
 
-    historical = df[df['category'].isin(categories)].copy()
+    # Rows come back ordered by category and date, trimmed to the date range
+    rows = get_frame_index(df).rows(categories, start=start_date, end=end_date)
 
-    return historical.sort_values(['category', 'date'])
+    return take_rows(df, rows)
 
 
 def get_category_breakdown(
@@ -94,6 +107,10 @@ def get_category_breakdown(
     """
     Get detailed breakdown of inflation by category for a specific date.
 
+    Snapshots are built once per date and cached with the metrics frame, so
+    repeated calls (top/bottom lists, percentiles) are a dictionary lookup.
+    The returned DataFrame is shared and must be treated as read-only.
+
     Args:
         df: CPI DataFrame with inflation metrics
         date: Specific date (YYYY-MM-DD), if None uses most recent
@@ -102,24 +119,31 @@ def get_category_breakdown(
         DataFrame with categories and their inflation metrics for the date
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
+    index = get_frame_index(df)
 
     # Get target date
     if date is None:
-        target_date = df['date'].max()
+        target_date = index.last_date
     else:
         target_date = pd.to_datetime(date)
 
-    # Get data for that date
-    snapshot = df[df['date'] == target_date].copy()
+    snapshots = _breakdown_cache.get(df)
+    if snapshots is None:
+        snapshots = _breakdown_cache.set(df, {})
+
+    if target_date not in snapshots:
+        # Get data for that date
+        snapshot = df.iloc[index.date_rows(target_date, target_date)]
 
-    # Remove rows without YoY data
-    snapshot = snapshot[snapshot['yoy_change'].notna()]
+        # Remove rows without YoY data
+        snapshot = snapshot[snapshot['yoy_change'].notna()]
 
-    # Sort by YoY change (descending)
-    snapshot = snapshot.sort_values('yoy_change', ascending=False)
+        # Sort by YoY change (descending)
+        snapshot = snapshot.sort_values('yoy_change', ascending=False)
+        snapshots[target_date] = snapshot
 
-    return snapshot
+    return snapshots[target_date]
 
 
 def get_category_trends(
@@ -139,16 +163,97 @@ def get_category_trends(
         DataFrame with category trends
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
+
+    # Filter date range; rows come back ordered by category and date
+    rows = get_frame_index(df).rows(start=start_date or None, end=end_date or None)
+
+    return take_rows(df, rows)
+
+
+def get_yoy_matrix(
+    df: pd.DataFrame,
+    categories: List[str],
+    start_date: Optional[str] = None
+) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+    """
+    Get YoY inflation as a category x month matrix for heatmaps.
+
+    Equivalent to pivoting the rows on or after start_date to categories by
+    dates and reindexing to `categories`, but fills a preallocated array
+    straight from each category's date-ordered rows.
+
+    Args:
+        df: CPI DataFrame with inflation metrics
+        categories: Row order of the matrix; absent categories are all NaN
+        start_date: Optional first date to include (YYYY-MM-DD)
+
+    Returns:
+        Tuple of (matrix with one row per category and one column per month
+        present in the selection, the months as a DatetimeIndex)
+    """
+    df = ensure_inflation_metrics(df)
+    index = get_frame_index(df)
+    dates = df['date'].to_numpy()
+    yoy = df['yoy_change'].to_numpy()
+
+    cat_rows = [index.rows([category], start=start_date) for category in categories]
+    months = np.unique(dates[np.concatenate(cat_rows)]) if cat_rows else dates[:0]
 
-    # Filter date range
-    result = df.copy()
-    if start_date:
-        result = result[result['date'] >= pd.to_datetime(start_date)]
-    if end_date:
-        result = result[result['date'] <= pd.to_datetime(end_date)]
+    matrix = np.full((len(categories), len(months)), np.nan, dtype=yoy.dtype)
+    for i, rows in enumerate(cat_rows):
+        matrix[i, np.searchsorted(months, dates[rows])] = yoy[rows]
 
-    return result.sort_values(['category', 'date'])
+    return matrix, pd.DatetimeIndex(months)
+
+
+def get_wide_table(
+    df: pd.DataFrame,
+    value_col: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Get one value column in wide format: categories as rows, months as columns.
+
+    Equivalent to pivoting the rows within the date range, but the full pivot
+    is built once per metrics frame and value column and only sliced here.
+    The returned DataFrame is shared and must be treated as read-only.
+
+    Args:
+        df: CPI DataFrame with inflation metrics
+        value_col: Column to spread across months ('value', 'yoy_change', ...)
+        start_date: Optional first date to include (YYYY-MM-DD)
+        end_date: Optional last date to include (YYYY-MM-DD)
+
+    Returns:
+        DataFrame indexed by category with one Timestamp column per month
+    """
+    df = ensure_inflation_metrics(df)
+
+    pivots = _wide_cache.get(df)
+    if pivots is None:
+        # Which (category, month) cells have a row at all, shared by every value column
+        present = df.pivot(index='category', columns='date', values='date').notna()
+        pivots = _wide_cache.set(df, {None: present})
+
+    if value_col not in pivots:
+        pivots[value_col] = df.pivot(index='category', columns='date', values=value_col)
+
+    wide = pivots[value_col]
+    if start_date is None and end_date is None:
+        return wide
+
+    months = wide.columns
+    in_range = np.ones(len(months), dtype=bool)
+    if start_date is not None:
+        in_range &= months >= pd.Timestamp(start_date)
+    if end_date is not None:
+        in_range &= months <= pd.Timestamp(end_date)
+
+    # Keep only categories with rows in the range, as a pivot of the slice would
+    has_rows = pivots[None].to_numpy()[:, in_range].any(axis=1)
+    return wide.iloc[has_rows, in_range]
 
 
 def compare_periods(
@@ -174,34 +279,28 @@ def compare_periods(
         Dictionary with comparison metrics for both periods
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
 
-    # Filter to category
-    cat_data = df[df['category'] == category].copy()
+    index = get_frame_index(df)
 
     # Get period 1 data
-    p1 = cat_data[
-        (cat_data['date'] >= pd.to_datetime(period1_start)) &
-        (cat_data['date'] <= pd.to_datetime(period1_end))
-    ]
+    p1 = take_rows(df, index.rows([category], start=period1_start, end=period1_end))
 
     # Get period 2 data
-    p2 = cat_data[
-        (cat_data['date'] >= pd.to_datetime(period2_start)) &
-        (cat_data['date'] <= pd.to_datetime(period2_end))
-    ]
+    p2 = take_rows(df, index.rows([category], start=period2_start, end=period2_end))
 
-    # Calculate summary stats for each period
+    # Calculate summary stats for each period on the raw YoY values
     def get_stats(data):
-        yoy = data['yoy_change'].dropna()
-        if len(yoy) == 0:
+        yoy = data['yoy_change'].to_numpy(dtype=np.float64)
+        yoy = yoy[~np.isnan(yoy)]
+        if yoy.size == 0:
             return {}
         return {
             'mean_inflation': yoy.mean(),
-            'median_inflation': yoy.median(),
+            'median_inflation': np.median(yoy),
             'min_inflation': yoy.min(),
             'max_inflation': yoy.max(),
-            'std_inflation': yoy.std(),
+            'std_inflation': yoy.std(ddof=1) if yoy.size > 1 else np.nan,
         }
 
     return {
@@ -219,6 +318,29 @@ def compare_periods(
     }
 
 
+def get_extreme_inflating_categories(
+    df: pd.DataFrame,
+    date: Optional[str] = None,
+    n: int = 10
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Get the top and bottom N categories by inflation at a given date.
+
+    Both ends come from the same sorted snapshot, so showing them together
+    costs a single breakdown.
+
+    Args:
+        df: CPI DataFrame
+        date: Specific date (YYYY-MM-DD), if None uses most recent
+        n: Number of categories to return at each end
+
+    Returns:
+        Tuple of (highest inflating categories, lowest inflating categories)
+    """
+    snapshot = get_category_breakdown(df, date)
+    return snapshot.head(n), snapshot.tail(n)
+
+
 def get_top_inflating_categories(
     df: pd.DataFrame,
     date: Optional[str] = None,
@@ -235,8 +357,7 @@ def get_top_inflating_categories(
     Returns:
         DataFrame with top inflating categories
     """
-    snapshot = get_category_breakdown(df, date)
-    return snapshot.head(n)
+    return get_extreme_inflating_categories(df, date, n)[0]
 
 
 def get_bottom_inflating_categories(
@@ -255,8 +376,61 @@ def get_bottom_inflating_categories(
     Returns:
         DataFrame with lowest inflating categories
     """
-    snapshot = get_category_breakdown(df, date)
-    return snapshot.tail(n)
+    return get_extreme_inflating_categories(df, date, n)[1]
+
+
+def _percentile_snapshot(df: pd.DataFrame, date: Optional[str]) -> Tuple[dict, np.ndarray]:
+    """
+    Get YoY changes by category and their sorted values for a date.
+
+    Cached per (frame, date) so repeated percentile lookups skip the
+    breakdown and the sort.
+    """
+    snapshots = _percentile_cache.get(df)
+    if snapshots is None:
+        snapshots = _percentile_cache.set(df, {})
+
+    if date not in snapshots:
+        snapshot = get_category_breakdown(df, date)
+        yoy = snapshot['yoy_change'].to_numpy(dtype=np.float64)
+        snapshots[date] = (
+            dict(zip(snapshot['category'].astype(str), yoy)),
+            np.sort(yoy),
+        )
+
+    return snapshots[date]
+
+
+def calculate_inflation_percentiles(
+    df: pd.DataFrame,
+    categories: List[str],
+    date: Optional[str] = None
+) -> dict:
+    """
+    Calculate inflation percentiles for several categories at once.
+
+    Args:
+        df: CPI DataFrame
+        categories: Categories to check
+        date: Specific date (YYYY-MM-DD), if None uses most recent
+
+    Returns:
+        Dictionary mapping category to percentile (0-100), NaN if not present
+    """
+    yoy_by_category, sorted_values = _percentile_snapshot(df, date)
+
+    result = {category: np.nan for category in categories}
+    present = [category for category in categories if category in yoy_by_category]
+    if not present:
+        return result
+
+    # Share of categories with strictly lower inflation, via binary search
+    targets = np.array([yoy_by_category[category] for category in present])
+    ranks = np.searchsorted(sorted_values, targets, side='left')
+    for category, rank in zip(present, ranks):
+        result[category] = rank / len(sorted_values) * 100
+
+    return result
 
 
 def calculate_inflation_percentile(
@@ -275,17 +449,7 @@ def calculate_inflation_percentile(
     Returns:
         Percentile (0-100)
     """
-    snapshot = get_category_breakdown(df, date)
-
-    if category not in snapshot['category'].values:
-        return np.nan
-
-    cat_inflation = snapshot[snapshot['category'] == category]['yoy_change'].values[0]
-    all_inflation = snapshot['yoy_change'].values
-
-    percentile = (all_inflation < cat_inflation).sum() / len(all_inflation) * 100
-
-    return percentile
+    return calculate_inflation_percentiles(df, [category], date)[category]
 
 
 def get_monthly_summary(
@@ -305,21 +469,20 @@ def get_monthly_summary(
         DataFrame with monthly summary
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
 
     # Parse year_month
-    target_date = pd.to_datetime(year_month)
+    period = pd.Period(year_month, freq='M')
 
     # Filter to that month
-    monthly = df[
-        (df['date'].dt.year == target_date.year) &
-        (df['date'].dt.month == target_date.month)
-    ].copy()
+    monthly = df.iloc[get_frame_index(df).date_rows(period.start_time, period.end_time)]
 
     if categories:
         monthly = monthly[monthly['category'].isin(categories)]
 
-    return monthly.sort_values('yoy_change', ascending=False)
+    monthly = monthly.sort_values('yoy_change', ascending=False)
+
+    return monthly
 
 
 def detect_inflation_trends(
@@ -343,33 +506,30 @@ def detect_inflation_trends(
             - previous_mean: Mean inflation over previous equal period
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
 
-    # Filter to category
-    cat_data = df[df['category'] == category].copy()
-    cat_data = cat_data.sort_values('date')
+    # Take only the last two lookback windows of the category (rows are ordered by date)
+    positions = get_frame_index(df).cat_rows(category)
+    window = df['yoy_change'].iloc[positions[max(len(positions) - lookback_months * 2, 0):]]
 
     # Get most recent period
-    recent = cat_data.tail(lookback_months)
+    recent = window.tail(lookback_months)
 
     # Get previous period for comparison
-    previous = cat_data.tail(lookback_months * 2).head(lookback_months)
+    previous = window.head(lookback_months)
 
     if len(recent) < 2 or len(previous) < 2:
         return {'trend': 'insufficient_data'}
 
     # Calculate means
-    recent_mean = recent['yoy_change'].mean()
-    previous_mean = previous['yoy_change'].mean()
+    recent_mean = recent.mean()
+    previous_mean = previous.mean()
 
-    # Calculate trend (simple linear regression on recent period)
-    from numpy.polynomial import polynomial as P
-    x = np.arange(len(recent))
-    y = recent['yoy_change'].values
-
-    # Fit linear polynomial
-    coeffs = P.polyfit(x, y, 1)
-    slope = coeffs[1]
+    # Calculate trend (closed-form least-squares slope on recent period)
+    y = recent.to_numpy(dtype=np.float64)
+    x = np.arange(len(y), dtype=np.float64)
+    x_centered = x - x.mean()
+    slope = np.dot(x_centered, y - y.mean()) / np.dot(x_centered, x_centered)
 
     # Determine trend
     if abs(slope) < 0.05:  # Less than 0.05% change per month
@@ -408,13 +568,11 @@ def get_volatility_metrics(
             - cv: Coefficient of variation
     """
     # Ensure we have inflation metrics
-    df = add_all_inflation_metrics(df)
-
-    # Filter to category and recent period
-    cat_data = df[df['category'] == category].copy()
-    cat_data = cat_data.sort_values('date').tail(months)
+    df = ensure_inflation_metrics(df)
 
-    yoy = cat_data['yoy_change'].dropna()
+    # Take the category's most recent rows (rows are ordered by date)
+    positions = get_frame_index(df).cat_rows(category)
+    yoy = df['yoy_change'].iloc[positions[max(len(positions) - months, 0):]].dropna()
 
     if len(yoy) < 2:
         return {}
@@ -10,47 +10,194 @@ This module provides functions to calculate various inflation metrics from CPI d
 
 import pandas as pd
 import numpy as np
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from ..data.frame_index import FrameCache, discard_frame, get_frame_index, take_rows
+from .kernels import (
+    group_starts,
+    group_positions,
+    grouped_shift,
+    grouped_diff,
+    grouped_pct_change,
+    grouped_rolling_mean,
+)
+
+# Columns produced by add_all_inflation_metrics()
+METRIC_COLUMNS = (
+    'mom_change',
+    'yoy_change',
+    'yoy_change_rolling_3m',
+    'yoy_change_rolling_6m',
+    'yoy_change_rolling_12m',
+    'annualized_mom',
+    'base_effect_contribution',
+    'value_12m_ago',
+)
+
+# Metrics computed by ensure_inflation_metrics(), per source frame
+_metrics_cache = FrameCache()
+
+# Per-category column arrays built by category_arrays(), per frame
+_category_arrays_cache = FrameCache()
+
+# Row order required by the grouped shift/rolling calculations
+SORT_ORDER = ['category', 'date']
+
+
+def is_sorted_by_category_date(df: pd.DataFrame) -> bool:
+    """
+    Check in one pass whether df's rows are already in (category, date) order.
+
+    The rows themselves are checked every time: a flag stored on the frame
+    (e.g. in df.attrs) would be copied onto derived frames by pandas, including
+    ones that were re-sorted since, and an O(N) scan is far cheaper than the
+    sort it lets callers skip.
+    """
+    if len(df) < 2:
+        return True
+
+    category = df['category']
+    if isinstance(category.dtype, pd.CategoricalDtype):
+        codes = category.cat.codes.to_numpy()
+    else:
+        codes, _ = pd.factorize(category, sort=True)
+
+    # Missing categories (-1) sort last, so they only pass the check when absent
+    if codes[0] < 0 or np.any(codes[1:] < codes[:-1]):
+        return False
 
+    dates = df['date'].to_numpy()
+    same_category = codes[1:] == codes[:-1]
+    with np.errstate(invalid='ignore'):
+        return bool(np.all(dates[1:][same_category] >= dates[:-1][same_category]))
 
-def calculate_mom_change(df: pd.DataFrame) -> pd.DataFrame:
+
+def sort_by_category_date(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sort by category then date, skipping the sort for frames already in order.
+
+    Args:
+        df: CPI DataFrame
+
+    Returns:
+        New DataFrame in (category, date) order (a shallow copy of df if it
+        was already in order)
+    """
+    if is_sorted_by_category_date(df):
+        return df.copy(deep=False)
+    return df.sort_values(SORT_ORDER)
+
+
+def _category_positions(df: pd.DataFrame) -> np.ndarray:
+    """
+    Get each row's position within its category for a (category, date) sorted frame.
+
+    Args:
+        df: CPI DataFrame sorted by category then date
+
+    Returns:
+        Integer array, 0 at the first row of each category
+    """
+    category = df['category']
+    if isinstance(category.dtype, pd.CategoricalDtype):
+        codes = category.cat.codes.to_numpy()
+    else:
+        codes, _ = pd.factorize(category)
+    return group_positions(group_starts(codes), len(codes))
+
+
+def _prepare(
+    df: pd.DataFrame,
+    positions: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Get the sorted frame to write metrics into and its within-category row positions.
+
+    Without inplace, the returned frame is a new object: either the sorted
+    result or a shallow copy. Copy-on-write keeps new columns written to it
+    from touching df, so no column data is duplicated up front.
+
+    Args:
+        df: CPI DataFrame
+        positions: Positions from an earlier _prepare() call on a frame with
+            the same row order; df is then assumed to be sorted already
+        inplace: Sort (if needed) and return df itself
+
+    Returns:
+        Tuple of (frame to add columns to, row positions within category)
+    """
+    if inplace:
+        result = df
+        if positions is None and not is_sorted_by_category_date(df):
+            df.sort_values(SORT_ORDER, inplace=True)
+            # Same object and length, so entries cached for the old row order look valid
+            discard_frame(df)
+    elif positions is not None:
+        result = df.copy(deep=False)
+    else:
+        result = sort_by_category_date(df)
+
+    if positions is None:
+        positions = _category_positions(result)
+    return result, positions
+
+
+def _pct_change_column(df: pd.DataFrame, positions: np.ndarray, periods: int) -> np.ndarray:
+    """Percentage change of 'value' over a number of rows within each category."""
+    values = df['value'].to_numpy(dtype=np.float64)
+    return grouped_pct_change(values, positions, periods) * 100
+
+
+def calculate_mom_change(
+    df: pd.DataFrame,
+    positions: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> pd.DataFrame:
     """
     Calculate month-over-month (MoM) percentage change.
 
     Args:
         df: CPI DataFrame with columns ['date', 'category', 'value']
+        positions: Optional within-category row positions for an already
+            sorted df (see add_all_inflation_metrics)
+        inplace: Add the column to df itself (sorting it in place if needed)
+            instead of returning a new frame
 
     Returns:
         DataFrame with additional 'mom_change' column (percentage)
     """
-    result = df.copy()
-
     # Sort by category and date to ensure proper ordering
-    result = result.sort_values(['category', 'date'])
+    result, positions = _prepare(df, positions, inplace)
 
     # Calculate percentage change within each category
-    result['mom_change'] = result.groupby('category')['value'].pct_change() * 100
+    result['mom_change'] = _pct_change_column(result, positions, 1)
 
     return result
 
 
-def calculate_yoy_change(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_yoy_change(
+    df: pd.DataFrame,
+    positions: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> pd.DataFrame:
     """
     Calculate year-over-year (YoY) percentage change.
 
     Args:
         df: CPI DataFrame with columns ['date', 'category', 'value']
+        positions: Optional within-category row positions for an already
+            sorted df (see add_all_inflation_metrics)
+        inplace: Add the column to df itself (sorting it in place if needed)
+            instead of returning a new frame
 
     Returns:
         DataFrame with additional 'yoy_change' column (percentage)
     """
-    result = df.copy()
-
     # Sort by category and date
-    result = result.sort_values(['category', 'date'])
+    result, positions = _prepare(df, positions, inplace)
 
     # Calculate YoY change (12 months ago)
-    result['yoy_change'] = result.groupby('category')['value'].pct_change(periods=12) * 100
+    result['yoy_change'] = _pct_change_column(result, positions, 12)
 
     return result
 
@@ -58,7 +205,9 @@ def calculate_yoy_change(df: pd.DataFrame) -> pd.DataFrame:
 def calculate_rolling_average(
     df: pd.DataFrame,
     column: str = 'yoy_change',
-    window: int = 3
+    window: int = 3,
+    positions: Optional[np.ndarray] = None,
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Calculate rolling average of a metric.
@@ -67,44 +216,80 @@ def calculate_rolling_average(
         df: DataFrame with inflation metrics
         column: Column name to calculate rolling average for
         window: Number of periods for rolling window
+        positions: Optional within-category row positions for an already
+            sorted df (see add_all_inflation_metrics)
+        inplace: Add the column to df itself (sorting it in place if needed)
+            instead of returning a new frame
 
     Returns:
         DataFrame with additional column for rolling average
     """
-    result = df.copy()
+    result, positions = _prepare(df, positions, inplace)
 
-    result[f'{column}_rolling_{window}m'] = (
-        result.groupby('category')[column]
-        .transform(lambda x: x.rolling(window=window, min_periods=1).mean())
+    result[f'{column}_rolling_{window}m'] = grouped_rolling_mean(
+        result[column].to_numpy(dtype=np.float64), positions, window
     )
 
     return result
 
 
-def calculate_annualized_rate(df: pd.DataFrame, months: int = 12) -> pd.DataFrame:
+def calculate_acceleration(
+    df: pd.DataFrame,
+    positions: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> pd.DataFrame:
+    """
+    Calculate inflation acceleration: the month-over-month change in the YoY rate.
+
+    Args:
+        df: DataFrame with a 'yoy_change' column
+        positions: Optional within-category row positions for an already
+            sorted df (see add_all_inflation_metrics)
+        inplace: Add the column to df itself (sorting it in place if needed)
+            instead of returning a new frame
+
+    Returns:
+        DataFrame with additional 'acceleration' column (percentage points),
+        stored at the precision of 'yoy_change'
+    """
+    result, positions = _prepare(df, positions, inplace)
+
+    yoy = result['yoy_change'].to_numpy()
+    acceleration = grouped_diff(yoy.astype(np.float64), positions, 1)
+    result['acceleration'] = acceleration.astype(yoy.dtype, copy=False)
+
+    return result
+
+
+def calculate_annualized_rate(
+    df: pd.DataFrame,
+    months: int = 12,
+    positions: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> pd.DataFrame:
     """
     Calculate annualized inflation rate over a specified period.
 
     Args:
         df: CPI DataFrame with columns ['date', 'category', 'value']
         months: Number of months to annualize over
+        positions: Optional within-category row positions for an already
+            sorted df (see add_all_inflation_metrics)
+        inplace: Add the column to df itself (sorting it in place if needed)
+            instead of returning a new frame
 
     Returns:
         DataFrame with additional 'annualized_rate' column
     """
-    result = df.copy()
-    result = result.sort_values(['category', 'date'])
+    result, positions = _prepare(df, positions, inplace)
 
     # Calculate percentage change over specified months
-    result[f'annualized_{months}m'] = (
-        result.groupby('category')['value']
-        .pct_change(periods=months) * 100
-    )
+    result[f'annualized_{months}m'] = _pct_change_column(result, positions, months)
 
     return result
 
 
-def add_all_inflation_metrics(df: pd.DataFrame) -> pd.DataFrame:
+def add_all_inflation_metrics(df: pd.DataFrame, precision: str = 'float32') -> pd.DataFrame:
     """
     Add all common inflation metrics to the DataFrame.
 
@@ -116,29 +301,145 @@ def add_all_inflation_metrics(df: pd.DataFrame) -> pd.DataFrame:
     - 12-month rolling average of YoY
     - Base effect metrics (annualized MoM, base effect contribution)
 
+    Metrics are computed in float64 and stored as `precision`. float32 halves
+    the memory of the eight metric columns and is far finer than the one or
+    two decimals the percentages are reported to; pass 'float64' to keep full
+    precision.
+
     Args:
         df: CPI DataFrame with columns ['date', 'category', 'value']
+        precision: Storage dtype for the metric columns, 'float32' or 'float64'
 
     Returns:
-        DataFrame with all inflation metrics
+        DataFrame with all inflation metrics and a categorical 'category' column
+
+    Raises:
+        ValueError: If precision is not 'float32' or 'float64'
     """
-    result = df.copy()
+    if precision not in ('float32', 'float64'):
+        raise ValueError(f"precision must be 'float32' or 'float64', got {precision!r}")
+
+    # Work on categorical codes rather than repeated category strings
+    if not isinstance(df['category'].dtype, pd.CategoricalDtype):
+        df = df.assign(category=df['category'].astype('category'))
+
+    # Sort and locate category boundaries once
+    result = sort_by_category_date(df)
+    positions = _category_positions(result)
+    values = result['value'].to_numpy(dtype=np.float64)
+
+    # Calculate basic changes; the 12-month lookback is shared by YoY and value_12m_ago
+    value_12m_ago = grouped_shift(values, positions, 12)
+    mom_change = grouped_pct_change(values, positions, 1) * 100
+    yoy_change = np.empty_like(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(values, value_12m_ago, out=yoy_change)
+    np.subtract(yoy_change, 1, out=yoy_change)
+    np.multiply(yoy_change, 100, out=yoy_change)
 
-    # Calculate basic changes
-    result = calculate_mom_change(result)
-    result = calculate_yoy_change(result)
+    # Calculate base effects
+    annualized_mom = mom_change * 12
+
+    metrics = {
+        'mom_change': mom_change,
+        'yoy_change': yoy_change,
+        'yoy_change_rolling_3m': grouped_rolling_mean(yoy_change, positions, 3),
+        'yoy_change_rolling_6m': grouped_rolling_mean(yoy_change, positions, 6),
+        'yoy_change_rolling_12m': grouped_rolling_mean(yoy_change, positions, 12),
+        'annualized_mom': annualized_mom,
+        'base_effect_contribution': yoy_change - annualized_mom,
+        'value_12m_ago': value_12m_ago,
+    }
 
-    # Calculate rolling averages
-    result = calculate_rolling_average(result, 'yoy_change', window=3)
-    result = calculate_rolling_average(result, 'yoy_change', window=6)
-    result = calculate_rolling_average(result, 'yoy_change', window=12)
+    # Attach every metric in one step instead of copying the frame per metric
+    return result.assign(**{
+        name: column.astype(precision, copy=False) for name, column in metrics.items()
+    })
 
-    # Calculate base effects
-    result = calculate_base_effects(result)
+
+def ensure_inflation_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a DataFrame that has all inflation metrics, computing them at most once.
+
+    Frames that already carry the metric columns (e.g. the app's prepared
+    dataset) are returned as-is. Otherwise the result of
+    add_all_inflation_metrics() is memoized for the lifetime of the source
+    frame, so repeated analysis calls on the same raw data reuse it.
+
+    Callers must treat the returned frame as read-only. The memo is keyed on
+    the source frame's identity and length, so code that edits the source in
+    place must call discard_frame() on it before asking for metrics again.
+
+    Args:
+        df: CPI DataFrame with columns ['date', 'category', 'value']
+
+    Returns:
+        DataFrame with all inflation metrics
+    """
+    if all(col in df.columns for col in METRIC_COLUMNS):
+        return df
+
+    result = _metrics_cache.get(df)
+    if result is None:
+        result = _metrics_cache.set(df, add_all_inflation_metrics(df))
 
     return result
 
 
+def category_frame(df: pd.DataFrame, category: str) -> pd.DataFrame:
+    """
+    Get one category's rows ordered by date.
+
+    Rows come from the cached category index, so no mask or sort is run; for
+    frames sorted by category and date the result is a slice of df. Treat
+    it as read-only, or copy it before adding columns.
+
+    Args:
+        df: CPI DataFrame
+        category: Category name
+
+    Returns:
+        DataFrame with the category's rows (empty if the category is absent)
+    """
+    return take_rows(df, get_frame_index(df).cat_rows(category))
+
+
+def category_arrays(df: pd.DataFrame, category: str) -> dict:
+    """
+    Get one category's columns as contiguous NumPy arrays ordered by date.
+
+    The arrays are gathered on the first request for a category and cached
+    for the lifetime of df, so per-category functions can work on plain
+    arrays without selecting rows from the frame on every call. The
+    returned arrays are read-only.
+
+    Args:
+        df: CPI DataFrame, with or without inflation metrics
+        category: Category name
+
+    Returns:
+        Dictionary of column name to array for 'date', 'value' and any
+        metric columns present (arrays are empty if the category is absent)
+    """
+    arrays = _category_arrays_cache.get(df)
+    if arrays is None:
+        arrays = _category_arrays_cache.set(df, {})
+
+    cat_arrays = arrays.get(category)
+    if cat_arrays is None:
+        rows = get_frame_index(df).cat_rows(category)
+        columns = ['date', 'value'] + [col for col in METRIC_COLUMNS if col in df.columns]
+
+        cat_arrays = {}
+        for col in columns:
+            values = df[col].to_numpy()[rows]
+            values.flags.writeable = False
+            cat_arrays[col] = values
+        arrays[category] = cat_arrays
+
+    return cat_arrays
+
+
 def get_latest_inflation_rate(
     df: pd.DataFrame,
     category: str = "All-items"
@@ -158,21 +459,19 @@ def get_latest_inflation_rate(
             - yoy_change: Latest year-over-year change
     """
     # Ensure we have the metrics
-    if 'yoy_change' not in df.columns:
-        df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
 
-    # Filter to category and get most recent non-null row
-    cat_data = df[df['category'] == category].copy()
-    cat_data = cat_data.sort_values('date', ascending=False)
+    # Category arrays are already ordered by date
+    arrays = category_arrays(df, category)
 
-    # Get latest row with valid YoY data
-    latest = cat_data[cat_data['yoy_change'].notna()].iloc[0]
+    # Get latest row with valid YoY data: the last non-NaN position
+    latest = np.flatnonzero(~np.isnan(arrays['yoy_change']))[-1]
 
     return {
-        'date': latest['date'],
-        'cpi_value': latest['value'],
-        'mom_change': latest.get('mom_change'),
-        'yoy_change': latest.get('yoy_change'),
+        'date': pd.Timestamp(arrays['date'][latest]),
+        'cpi_value': arrays['value'][latest],
+        'mom_change': arrays['mom_change'][latest],
+        'yoy_change': arrays['yoy_change'][latest],
     }
 
 
@@ -195,19 +494,14 @@ def compare_categories(
         DataFrame with categories and their inflation metrics
     """
     # Ensure we have the metrics
-    if 'yoy_change' not in df.columns:
-        df = add_all_inflation_metrics(df)
+    df = ensure_inflation_metrics(df)
 
-    # Filter to specified categories
-    result = df[df['category'].isin(categories)].copy()
+    # Filter to specified categories and dates; each category's date range is
+    # located with a binary search over its date-ordered rows
+    rows = get_frame_index(df).rows(categories, start=start_date or None, end=end_date or None)
 
-    # Apply date filters if provided
-    if start_date:
-        result = result[result['date'] >= pd.to_datetime(start_date)]
-    if end_date:
-        result = result[result['date'] <= pd.to_datetime(end_date)]
-
-    return result
+    # Keep the original row order (index order already matches it for sorted frames)
+    return take_rows(df, np.sort(rows))
 
 
 def calculate_cumulative_inflation(
@@ -227,26 +521,55 @@ def calculate_cumulative_inflation(
     Returns:
         DataFrame with cumulative inflation column
     """
-    cat_data = df[df['category'] == category].copy()
-    cat_data = cat_data.sort_values('date')
+    return calculate_cumulative_inflation_by_category(df, [category], start_date)
+
+
+def calculate_cumulative_inflation_by_category(
+    df: pd.DataFrame,
+    categories: List[str],
+    start_date: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Calculate cumulative inflation from a starting point for several categories.
+
+    Each category is measured against its own first value on or after
+    start_date, all in one pass over the selected rows.
+
+    Args:
+        df: CPI DataFrame
+        categories: Categories to calculate for
+        start_date: Starting date for cumulative calculation (YYYY-MM-DD)
+                   If None, uses first date in data
 
-    if start_date:
-        start = pd.to_datetime(start_date)
-        cat_data = cat_data[cat_data['date'] >= start]
+    Returns:
+        DataFrame with cumulative inflation column, ordered by category and date
+    """
+    # Category rows from the index, ordered by category and date and trimmed to start_date
+    rows = get_frame_index(df).rows(categories, start=start_date or None)
+    cat_data = take_rows(df, rows)
 
     if len(cat_data) == 0:
         return cat_data
 
-    # Get baseline CPI value
-    baseline_cpi = cat_data.iloc[0]['value']
+    # Baseline CPI value for each row: the first row of its category
+    values = cat_data['value'].to_numpy()
+    baseline_rows = np.arange(len(values)) - _category_positions(cat_data)
 
-    # Calculate cumulative percentage change from baseline
-    cat_data['cumulative_inflation'] = ((cat_data['value'] / baseline_cpi) - 1) * 100
+    # Calculate cumulative percentage change from baseline, in one output buffer
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cumulative = np.divide(values, values[baseline_rows])
+    np.subtract(cumulative, 1, out=cumulative)
+    np.multiply(cumulative, 100, out=cumulative)
 
-    return cat_data
+    # cat_data may be a slice of df, so add the column to a new frame
+    return cat_data.assign(cumulative_inflation=cumulative)
 
 
-def calculate_base_effects(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_base_effects(
+    df: pd.DataFrame,
+    positions: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> pd.DataFrame:
     """
     Calculate base effect metrics to identify when Y oY changes are driven by
     what happened 12 months ago rather than current price momentum.
@@ -257,6 +580,10 @@ def calculate_base_effects(df: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         df: CPI DataFrame with mom_change and yoy_change columns
+        positions: Optional within-category row positions for an already
+            sorted df (see add_all_inflation_metrics)
+        inplace: Add the column to df itself (sorting it in place if needed)
+            instead of returning a new frame
 
     Returns:
         DataFrame with additional columns:
@@ -264,19 +591,21 @@ def calculate_base_effects(df: pd.DataFrame) -> pd.DataFrame:
             - base_effect_contribution: Difference between YoY and annualized MoM
             - value_12m_ago: CPI value from 12 months ago (for reference)
     """
-    result = df.copy()
-    result = result.sort_values(['category', 'date'])
+    result, positions = _prepare(df, positions, inplace)
 
     # Annualize the month-over-month change (current momentum)
-    result['annualized_mom'] = result['mom_change'] * 12
+    annualized_mom = np.multiply(result['mom_change'].to_numpy(), 12)
+    result['annualized_mom'] = annualized_mom
 
     # Base effect contribution: how much of YoY is due to base vs current momentum
     # Positive = YoY higher than current momentum suggests (base pulling it up)
     # Negative = YoY lower than current momentum suggests (base pulling it down)
-    result['base_effect_contribution'] = result['yoy_change'] - result['annualized_mom']
+    result['base_effect_contribution'] = np.subtract(result['yoy_change'].to_numpy(), annualized_mom)
 
     # Get CPI value from 12 months ago for reference
-    result['value_12m_ago'] = result.groupby('category')['value'].shift(12)
+    result['value_12m_ago'] = grouped_shift(
+        result['value'].to_numpy(dtype=np.float64), positions, 12
+    )
 
     return result
 
@@ -305,25 +634,36 @@ def project_future_yoy(
     Returns:
         DataFrame with projected dates and YoY values
     """
-    cat_data = df[df['category'] == category].copy()
-    cat_data = cat_data.sort_values('date')
+    # Ensure we have the metrics
+    df = ensure_inflation_metrics(df)
+
+    # Category arrays are already ordered by date
+    arrays = category_arrays(df, category)
+    dates = arrays['date']
+    values = arrays['value']
+    mom_changes = arrays['mom_change']
 
     # Get the most recent data point
-    latest = cat_data.iloc[-1]
-    latest_date = latest['date']
-    latest_value = latest['value']
+    latest_idx = len(dates) - 1
+    latest_date = pd.Timestamp(dates[latest_idx])
+    latest_value = np.float64(values[latest_idx])
 
-    # Determine MoM assumption
+    # Determine MoM assumption (in float64, whatever the storage precision)
     if mom_assumption == "zero":
         mom_rate = 0.0
     elif mom_assumption == "current":
-        mom_rate = latest.get('mom_change', 0) / 100
+        mom_rate = np.float64(mom_changes[latest_idx]) / 100
     else:  # recent_average
-        recent_mom = cat_data.tail(3)['mom_change'].mean() / 100
+        # Series.mean skips missing months like the frame-based version did
+        recent_mom = pd.Series(mom_changes[-3:], dtype=np.float64).mean() / 100
         mom_rate = recent_mom
 
-    # Project future values
-    projections = []
+    # Project future values into preallocated float64 columns; months without
+    # a 12-month baseline are dropped at the end
+    projected_values = np.empty(months_ahead, dtype=np.float64)
+    projected_yoy = np.empty(months_ahead, dtype=np.float64)
+    future_dates = np.empty(months_ahead, dtype=dates.dtype)
+    has_baseline = np.zeros(months_ahead, dtype=bool)
     current_value = latest_value
 
     for i in range(1, months_ahead + 1):
@@ -331,24 +671,33 @@ def project_future_yoy(
         current_value = current_value * (1 + mom_rate)
         future_date = latest_date + pd.DateOffset(months=i)
 
-        # Get value from 12 months before this future date
-        lookback_date = future_date - pd.DateOffset(months=12)
-        value_12m_ago_row = cat_data[cat_data['date'] == lookback_date]
-
-        if len(value_12m_ago_row) > 0:
-            value_12m_ago = value_12m_ago_row.iloc[0]['value']
-            projected_yoy = ((current_value / value_12m_ago) - 1) * 100
-
-            projections.append({
-                'date': future_date,
-                'category': category,
-                'value': current_value,
-                'yoy_change': projected_yoy,
-                'is_projection': True,
-                'assumption': mom_assumption
-            })
-
-    return pd.DataFrame(projections)
+        # Get value from 12 months before this future date. Monthly data puts
+        # it exactly 12 - i rows back; fall back to a binary search on gaps.
+        lookback_date = (future_date - pd.DateOffset(months=12)).to_datetime64()
+        pos = latest_idx + i - 12
+        if not 0 <= pos <= latest_idx or dates[pos] != lookback_date:
+            pos = np.searchsorted(dates, lookback_date, side='left')
+
+        if pos < len(dates) and dates[pos] == lookback_date:
+            value_12m_ago = np.float64(values[pos])
+            future_dates[i - 1] = future_date.to_datetime64()
+            projected_values[i - 1] = current_value
+            projected_yoy[i - 1] = ((current_value / value_12m_ago) - 1) * 100
+            has_baseline[i - 1] = True
+
+    count = int(has_baseline.sum())
+    if count == 0:
+        return pd.DataFrame()
+
+    # Store in the frame's own precision
+    return pd.DataFrame({
+        'date': future_dates[has_baseline],
+        'category': np.full(count, category),
+        'value': projected_values[has_baseline].astype(values.dtype),
+        'yoy_change': projected_yoy[has_baseline].astype(arrays['yoy_change'].dtype),
+        'is_projection': np.ones(count, dtype=bool),
+        'assumption': np.full(count, mom_assumption),
+    })
 
 
 def identify_base_effect_periods(
@@ -373,19 +722,28 @@ def identify_base_effect_periods(
     Returns:
         DataFrame with periods flagged as base effect driven
     """
-    cat_data = df[df['category'] == category].copy()
-    cat_data = cat_data.sort_values('date')
+    # Ensure we have the metrics
+    df = ensure_inflation_metrics(df)
+
+    # Category rows and arrays come from the index already ordered by date
+    rows = get_frame_index(df).cat_rows(category)
+    arrays = category_arrays(df, category)
+    yoy = arrays['yoy_change']
+    mom = arrays['mom_change']
 
     # Calculate change in YoY (how much did YoY move this month?)
-    cat_data['yoy_change_delta'] = cat_data['yoy_change'].diff()
+    yoy_delta = np.empty_like(yoy)
+    yoy_delta[:1] = np.nan
+    np.subtract(yoy[1:], yoy[:-1], out=yoy_delta[1:])
 
-    # Flag base effect periods
-    cat_data['is_base_effect'] = (
-        (abs(cat_data['yoy_change_delta']) > yoy_threshold) &
-        (abs(cat_data['mom_change']) < mom_threshold)
-    )
+    # Flag base effect periods (NaN comparisons are False)
+    with np.errstate(invalid='ignore'):
+        is_base_effect = (np.abs(yoy_delta) > yoy_threshold) & (np.abs(mom) < mom_threshold)
 
-    return cat_data[cat_data['is_base_effect']]
+    return df.iloc[rows[is_base_effect]].assign(
+        yoy_change_delta=yoy_delta[is_base_effect],
+        is_base_effect=True,
+    )
 
 
 def get_inflation_summary_stats(
@@ -413,29 +771,24 @@ def get_inflation_summary_stats(
             - current_yoy: Most recent YoY inflation
     """
     # Ensure we have the metrics
-    if 'yoy_change' not in df.columns:
-        df = add_all_inflation_metrics(df)
-
-    # Filter data
-    data = df[df['category'] == category].copy()
+    df = ensure_inflation_metrics(df)
 
-    if start_date:
-        data = data[data['date'] >= pd.to_datetime(start_date)]
-    if end_date:
-        data = data[data['date'] <= pd.to_datetime(end_date)]
+    # Filter data (rows are ordered by date)
+    rows = get_frame_index(df).rows([category], start=start_date or None, end=end_date or None)
 
-    # Remove NaN values
-    yoy_data = data['yoy_change'].dropna()
+    # Remove NaN values, working on the raw array to skip pandas dispatch per statistic
+    yoy_data = df['yoy_change'].to_numpy(dtype=np.float64)[rows]
+    yoy_data = yoy_data[~np.isnan(yoy_data)]
 
-    if len(yoy_data) == 0:
+    if yoy_data.size == 0:
         return {}
 
     return {
         'mean_yoy': yoy_data.mean(),
-        'median_yoy': yoy_data.median(),
-        'std_yoy': yoy_data.std(),
+        'median_yoy': np.median(yoy_data),
+        'std_yoy': yoy_data.std(ddof=1) if yoy_data.size > 1 else np.nan,
         'min_yoy': yoy_data.min(),
         'max_yoy': yoy_data.max(),
-        'current_yoy': yoy_data.iloc[-1] if len(yoy_data) > 0 else None,
-        'count': len(yoy_data),
+        'current_yoy': yoy_data[-1],
+        'count': int(yoy_data.size),
     }
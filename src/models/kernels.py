@@ -0,0 +1,140 @@
+"""
+Grouped Array Kernels
+
+Vectorized NumPy building blocks for per-category time-series calculations.
+
+All kernels operate on flat arrays that are already ordered by category and
+then date, so each category is one contiguous segment. A segment is described
+by the position of each row within it (0 for the first row of a category),
+which lets shifts and differences be done as whole-array slices with the
+cross-category boundaries masked out afterwards.
+"""
+
+import numpy as np
+
+
+def group_starts(codes: np.ndarray) -> np.ndarray:
+    """
+    Get the first row of each contiguous group.
+
+    Args:
+        codes: Integer group codes, contiguous per group
+
+    Returns:
+        Integer array of segment start positions
+    """
+    if len(codes) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+
+
+def group_positions(starts: np.ndarray, n: int) -> np.ndarray:
+    """
+    Get each row's position within its group.
+
+    Args:
+        starts: Segment start positions from group_starts()
+        n: Total number of rows
+
+    Returns:
+        Integer array where the first row of each group is 0
+    """
+    lengths = np.diff(np.append(starts, n))
+    return np.arange(n) - np.repeat(starts, lengths)
+
+
+def grouped_shift(values: np.ndarray, positions: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Shift values forward by a number of rows within each group.
+
+    Equivalent to groupby(...).shift(periods) for periods >= 1.
+
+    Args:
+        values: Float array ordered by group then date
+        positions: Row positions within group from group_positions()
+        periods: Number of rows to shift
+
+    Returns:
+        Float64 array with NaN where no earlier row exists in the group
+    """
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    out[positions < periods] = np.nan
+    return out
+
+
+def grouped_diff(values: np.ndarray, positions: np.ndarray, periods: int = 1) -> np.ndarray:
+    """
+    Difference from the value a number of rows earlier in each group.
+
+    Equivalent to groupby(...).diff(periods) for periods >= 1.
+
+    Args:
+        values: Float array ordered by group then date
+        positions: Row positions within group from group_positions()
+        periods: Number of rows to look back
+
+    Returns:
+        Float64 array with NaN where no earlier row exists in the group
+    """
+    return values - grouped_shift(values, positions, periods)
+
+
+def grouped_pct_change(values: np.ndarray, positions: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Fractional change from the value a number of rows earlier in each group.
+
+    Equivalent to groupby(...).pct_change(periods) with no gap filling.
+
+    Args:
+        values: Float array ordered by group then date
+        positions: Row positions within group from group_positions()
+        periods: Number of rows to look back
+
+    Returns:
+        Float64 array of changes (not multiplied by 100)
+    """
+    previous = grouped_shift(values, positions, periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return values / previous - 1
+
+
+def grouped_rolling_mean(values: np.ndarray, positions: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over up to `window` rows within each group, skipping NaNs.
+
+    Equivalent to groupby(...).rolling(window, min_periods=1).mean(): windows
+    are truncated at the start of each group, non-finite values (NaN, +/-inf)
+    are skipped as pandas does, and a row is NaN only if its window holds no
+    finite value.
+
+    Uses prefix sums, so the cost is a few passes over the array regardless
+    of window length.
+
+    Args:
+        values: Float array ordered by group then date
+        positions: Row positions within group from group_positions()
+        window: Number of rows in the window
+
+    Returns:
+        Float64 array of rolling means
+    """
+    n = len(values)
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.isfinite(values)
+
+    # Prefix sums with a leading zero so window sums are sums[end] - sums[start]
+    sums = np.zeros(n + 1)
+    np.cumsum(np.where(valid, values, 0.0), out=sums[1:])
+    counts = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(valid, out=counts[1:])
+
+    end = np.arange(1, n + 1)
+    start = end - 1 - np.minimum(positions, window - 1)
+
+    window_counts = counts[end] - counts[start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = (sums[end] - sums[start]) / window_counts
+    means[window_counts == 0] = np.nan
+    return means
@@ -12,14 +12,16 @@ import plotly.express as px
 from shiny import render, reactive, ui
 from htmltools import HTML
 import logging
-import io
 from datetime import datetime
 
-from ..data.cache import get_cached_or_download, get_cache_info
+from ..data.cache import get_cached_or_download, get_cache_info, is_cache_valid
+from ..data.frame_index import get_frame_index
 from ..models.inflation import (
     add_all_inflation_metrics,
+    category_frame,
+    calculate_acceleration,
+    calculate_cumulative_inflation_by_category,
     get_latest_inflation_rate,
-    get_inflation_summary_stats,
     project_future_yoy,
     identify_base_effect_periods,
 )
@@ -27,7 +29,8 @@ from ..models.analysis import (
     get_recent_trends,
     get_historical_comparison,
     get_category_breakdown,
-    get_category_trends,
+    get_yoy_matrix,
+    get_wide_table,
 )
 from ..utils.formatting import (
     format_percentage,
@@ -35,11 +38,74 @@ from ..utils.formatting import (
     format_date_short,
     format_change_with_indicator,
     sort_categories,
+    SHORT_DATE_FORMAT,
 )
-from ..utils.export import create_excel_report, create_simple_csv_export
+from ..utils.export import get_excel_report_bytes, iter_csv_chunks, iter_csv_export
+from ..utils.downsample import downsample_lines
+from .output_cache import OutputCache
+from .debounce import debounce
+from .plotly_output import render_plotly, figure_payload, typed_array
+from ..ui.plotly_output import output_plotly
 
 logger = logging.getLogger(__name__)
 
+# Metrics frame shared by all sessions, with the state of the cache file it was built from
+_shared_data = None
+
+
+# Traces of the rolling averages plot: (column, trace name, line style)
+_ROLLING_TRACES = [
+    ('yoy_change', 'YoY (Monthly)', dict(line=dict(color='lightgray', width=1), opacity=0.5)),
+    ('yoy_change_rolling_3m', '3-Month Average', dict(line=dict(color='blue', width=2))),
+    ('yoy_change_rolling_6m', '6-Month Average', dict(line=dict(color='orange', width=2))),
+    ('yoy_change_rolling_12m', '12-Month Average', dict(line=dict(color='red', width=2, dash='dash'))),
+]
+
+# Layout of the rolling averages plot, resolved against the default template once
+_ROLLING_LAYOUT = go.Figure(layout=dict(
+    yaxis_title="Inflation Rate (%)",
+    xaxis_title="",
+    hovermode='x unified',
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    height=350,
+    margin=dict(t=60, b=40)
+)).to_plotly_json()['layout']
+
+
+def _cache_state() -> tuple:
+    """Identify the current cache file by path, size and modification time."""
+    info = get_cache_info()
+    return (info['path'], info.get('size_mb'), info.get('last_modified'))
+
+
+def load_cpi_data(force_refresh: bool = False) -> pd.DataFrame:
+    """
+    Load CPI data with inflation metrics, shared across sessions.
+
+    While the cache file is valid and unchanged, new sessions reuse the frame
+    built by an earlier one (along with its category index and analysis
+    caches) instead of re-reading the cache and recomputing every metric.
+    The returned frame is shared and must be treated as read-only.
+
+    Args:
+        force_refresh: If True, download fresh data and rebuild the frame
+
+    Returns:
+        CPI DataFrame with inflation metrics
+    """
+    global _shared_data
+
+    if not force_refresh and _shared_data is not None and is_cache_valid():
+        state, df = _shared_data
+        if state == _cache_state():
+            return df
+
+    df = add_all_inflation_metrics(get_cached_or_download(force_refresh=force_refresh))
+    # Build the category/date index now rather than in the first render
+    get_frame_index(df)
+    _shared_data = (_cache_state(), df)
+    return df
+
 
 def server(input, output, session):
     """Main server function for the Shiny app."""
@@ -48,8 +114,7 @@ def server(input, output, session):
     # Load data eagerly when session starts to ensure charts display immediately
     logger.info("Loading initial CPI data...")
     try:
-        initial_df = get_cached_or_download(force_refresh=False)
-        initial_df = add_all_inflation_metrics(initial_df)
+        initial_df = load_cpi_data()
         logger.info(f"Loaded {len(initial_df)} data points")
     except Exception as e:
         logger.error(f"Failed to load initial data: {e}")
@@ -63,6 +128,28 @@ def server(input, output, session):
     # Track when data was last loaded
     data_load_time = reactive.Value(datetime.now() if initial_df is not None else None)
 
+    # Bumped whenever new data is loaded; part of every cached output's key
+    data_version = reactive.Value(0)
+
+    # Rendered figures for this session, keyed by data version and inputs
+    figure_cache = OutputCache(data_version.get)
+
+    # Slider and date inputs, passed on once they stop changing while being dragged
+    debounced_recent_months = debounce(0.25)(input.recent_months)
+    debounced_historical_date_range = debounce(0.25)(input.historical_date_range)
+    debounced_heatmap_months = debounce(0.25)(input.heatmap_months)
+    debounced_breakdown_date = debounce(0.25)(input.breakdown_date)
+    debounced_breakdown_top_n = debounce(0.25)(input.breakdown_top_n)
+    debounced_custom_date_range = debounce(0.25)(input.custom_date_range)
+
+    def set_data(df):
+        """Publish newly loaded data and invalidate cached figures."""
+        figure_cache.clear()
+        cpi_data.set(df)
+        data_load_time.set(datetime.now())
+        with reactive.isolate():
+            data_version.set(data_version.get() + 1)
+
     # ===== DATA LOADING =====
 
     @reactive.Effect
@@ -77,10 +164,8 @@ def server(input, output, session):
         )
 
         try:
-            df = get_cached_or_download(force_refresh=False)
-            df = add_all_inflation_metrics(df)
-            cpi_data.set(df)
-            data_load_time.set(datetime.now())
+            df = load_cpi_data()
+            set_data(df)
             ui.notification_show("Data loaded successfully!", type="message", duration=3)
             logger.info("Data load complete")
         except Exception as e:
@@ -103,10 +188,8 @@ def server(input, output, session):
         )
 
         try:
-            df = get_cached_or_download(force_refresh=True)
-            df = add_all_inflation_metrics(df)
-            cpi_data.set(df)
-            data_load_time.set(datetime.now())
+            df = load_cpi_data(force_refresh=True)
+            set_data(df)
             ui.notification_show("Data refreshed successfully!", type="message", duration=3)
             logger.info("Data refresh complete")
         except Exception as e:
@@ -142,6 +225,35 @@ def server(input, output, session):
             ui.p(f"Loaded: {load_time_str}", class_="text-muted", style="margin: 0;"),
         )
 
+    # ===== SHARED DERIVED DATA =====
+
+    @reactive.Calc
+    def all_categories_sorted():
+        """All categories in the loaded data in display order, computed once per load."""
+        df = cpi_data.get()
+        if df is None:
+            return []
+
+        return sort_categories(df['category'].unique().tolist())
+
+    @reactive.Calc
+    def all_items_latest():
+        """Latest All-items reading, shared by the metric cards."""
+        df = cpi_data.get()
+        if df is None:
+            return None
+
+        return get_latest_inflation_rate(df, "All-items")
+
+    @reactive.Calc
+    def all_items_tail():
+        """Last 12 months of All-items data, shared by the metric cards."""
+        df = cpi_data.get()
+        if df is None:
+            return None
+
+        return category_frame(df, 'All-items').tail(12)
+
     # ===== RECENT TRENDS TAB =====
 
     @reactive.Calc
@@ -151,7 +263,7 @@ def server(input, output, session):
         if df is None:
             return None
 
-        months = input.recent_months()
+        months = debounced_recent_months()
         categories = list(input.recent_categories())
 
         if not categories:
@@ -159,18 +271,26 @@ def server(input, output, session):
 
         return get_recent_trends(df, months=months, categories=categories)
 
+    @reactive.Calc
+    def get_recent_acceleration():
+        """Recent trends data with acceleration (change in YoY rate) added."""
+        recent_data = get_recent_data()
+        if recent_data is None or len(recent_data) == 0:
+            return recent_data
+
+        # Every category in one pass (recent data is already ordered by category and date)
+        return calculate_acceleration(recent_data)
+
     # ===== NEW ENHANCED METRIC CARDS =====
 
     @output
     @render.ui
     def metric_current_inflation():
         """Display current inflation rate metric."""
-        df = cpi_data.get()
-        if df is None:
+        latest = all_items_latest()
+        if latest is None:
             return ui.p("Loading...")
 
-        latest = get_latest_inflation_rate(df, "All-items")
-
         return ui.div(
             ui.div("Current Inflation (YoY)", class_="metric-label"),
             ui.div(format_percentage(latest['yoy_change'], decimals=1), class_="metric-value"),
@@ -182,12 +302,10 @@ def server(input, output, session):
     @render.ui
     def metric_mom_change():
         """Display month-over-month change."""
-        df = cpi_data.get()
-        if df is None:
+        latest = all_items_latest()
+        if latest is None:
             return ui.p("Loading...")
 
-        latest = get_latest_inflation_rate(df, "All-items")
-
         color = "positive" if latest['mom_change'] > 0 else "negative" if latest['mom_change'] < 0 else "neutral"
 
         return ui.div(
@@ -205,12 +323,12 @@ def server(input, output, session):
     @render.ui
     def metric_trend_direction():
         """Display trend direction (3-month average)."""
-        df = cpi_data.get()
-        if df is None:
+        all_items = all_items_tail()
+        if all_items is None:
             return ui.p("Loading...")
 
         # Get All-items data
-        all_items = df[df['category'] == 'All-items'].sort_values('date').tail(4)
+        all_items = all_items.tail(4)
 
         if len(all_items) < 4:
             return ui.div("Insufficient data", class_="metric-card")
@@ -235,12 +353,12 @@ def server(input, output, session):
     @render.ui
     def metric_acceleration():
         """Display inflation acceleration/deceleration."""
-        df = cpi_data.get()
-        if df is None:
+        all_items = all_items_tail()
+        if all_items is None:
             return ui.p("Loading...")
 
         # Get All-items recent data
-        all_items = df[df['category'] == 'All-items'].sort_values('date').tail(3)
+        all_items = all_items.tail(3)
 
         if len(all_items) < 3:
             return ui.div("Insufficient data", class_="metric-card")
@@ -264,7 +382,8 @@ def server(input, output, session):
         )
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(debounced_recent_months, input.recent_categories, input.show_target_line)
     def recent_yoy_plot():
         """Plot year-over-year inflation trends with enhanced features."""
         recent_data = get_recent_data()
@@ -314,7 +433,7 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     @output
     @render.ui
@@ -330,9 +449,7 @@ def server(input, output, session):
             return ui.div()
 
         # Focus on All-items for base effects (avoid clutter)
-        all_items_recent = recent_data[recent_data['category'] == 'All-items'].copy()
-
-        if len(all_items_recent) == 0:
+        if not (recent_data['category'] == 'All-items').any():
             return ui.div()
 
         return ui.div(
@@ -343,12 +460,13 @@ def server(input, output, session):
                 "The chart below shows actual YoY inflation vs. annualized month-over-month changes (current momentum) and projections.",
                 style="font-size: 13px; color: #6c757d; margin-bottom: 15px;"
             ),
-            ui.output_ui("base_effects_plot"),
+            output_plotly("base_effects_plot"),
             style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-top: 15px;"
         )
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(input.show_base_effects, input.base_effects_momentum, debounced_recent_months)
     def base_effects_plot():
         """Plot base effects analysis with projections."""
         if not input.show_base_effects():
@@ -362,35 +480,41 @@ def server(input, output, session):
         momentum_period = input.base_effects_momentum()
 
         # Get recent data for All-items
-        months = input.recent_months()
-        all_items = df[df['category'] == 'All-items'].copy()
-        all_items = all_items.sort_values('date')
+        months = debounced_recent_months()
+        all_items = category_frame(df, 'All-items')
 
         # Get recent data
         cutoff_date = all_items['date'].max() - pd.DateOffset(months=months)
-        all_items_recent = all_items[all_items['date'] >= cutoff_date].copy()
+        all_items_recent = all_items[all_items['date'] >= cutoff_date]
 
-        # Calculate momentum based on selected period
+        # Calculate momentum based on selected period. The columns are added with
+        # assign() so the filtered rows of the shared frame are never written to.
+        momentum_columns = {}
         if momentum_period == "monthly":
             # Use single month MoM annualized (existing annualized_mom)
             momentum_label = "Monthly Momentum"
-            all_items_recent['current_momentum'] = all_items_recent['annualized_mom']
+            momentum_columns['current_momentum'] = all_items_recent['annualized_mom']
             projection_assumption = "recent_average"
         elif momentum_period == "quarterly":
             # Use 3-month average MoM annualized
             momentum_label = "Quarterly Momentum (3-mo avg)"
-            all_items_recent['mom_3m_avg'] = all_items_recent['mom_change'].rolling(window=3, min_periods=1).mean()
-            all_items_recent['current_momentum'] = all_items_recent['mom_3m_avg'] * 12
+            mom_3m_avg = all_items_recent['mom_change'].rolling(window=3, min_periods=1).mean()
+            momentum_columns['mom_3m_avg'] = mom_3m_avg
+            momentum_columns['current_momentum'] = mom_3m_avg * 12
             projection_assumption = "recent_average"  # Will use 3-month avg in projection
         else:  # half_year
             # Use 6-month average MoM annualized
             momentum_label = "Half-Year Momentum (6-mo avg)"
-            all_items_recent['mom_6m_avg'] = all_items_recent['mom_change'].rolling(window=6, min_periods=1).mean()
-            all_items_recent['current_momentum'] = all_items_recent['mom_6m_avg'] * 12
+            mom_6m_avg = all_items_recent['mom_change'].rolling(window=6, min_periods=1).mean()
+            momentum_columns['mom_6m_avg'] = mom_6m_avg
+            momentum_columns['current_momentum'] = mom_6m_avg * 12
             projection_assumption = "recent_average"
 
         # Recalculate base effect contribution using selected momentum
-        all_items_recent['base_effect_current'] = all_items_recent['yoy_change'] - all_items_recent['current_momentum']
+        all_items_recent = all_items_recent.assign(
+            **momentum_columns,
+            base_effect_current=lambda d: d['yoy_change'] - d['current_momentum']
+        )
 
         # Project future YoY
         projection_zero = project_future_yoy(df, "All-items", months_ahead=3, mom_assumption="zero")
@@ -473,33 +597,24 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(debounced_recent_months, input.recent_categories)
     def inflation_acceleration_plot():
         """Plot inflation acceleration/deceleration (change in YoY rate)."""
-        recent_data = get_recent_data()
-        if recent_data is None or len(recent_data) == 0:
+        accel_df = get_recent_acceleration()
+        if accel_df is None or len(accel_df) == 0:
             return ui.p("No data available")
 
-        # Calculate acceleration for each category
-        accel_data = []
-        for category in recent_data['category'].unique():
-            cat_data = recent_data[recent_data['category'] == category].sort_values('date')
-            cat_data = cat_data.copy()
-            cat_data['acceleration'] = cat_data['yoy_change'].diff()
-            accel_data.append(cat_data)
-
-        accel_df = pd.concat(accel_data, ignore_index=True)
+        by_category = accel_df.groupby('category', observed=True, sort=False)
 
         fig = go.Figure()
 
-        for category in accel_df['category'].unique():
-            cat_data = accel_df[accel_df['category'] == category]
-
+        for category, cat_data in by_category:
             # Create bar chart with conditional coloring
-            colors = ['red' if x > 0 else 'green' for x in cat_data['acceleration']]
+            colors = np.where(cat_data['acceleration'].to_numpy() > 0, 'red', 'green').tolist()
 
             fig.add_trace(go.Bar(
                 x=cat_data['date'],
@@ -516,7 +631,7 @@ def server(input, output, session):
             legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
             height=350,
             margin=dict(t=60, b=40),
-            showlegend=len(accel_df['category'].unique()) > 1
+            showlegend=by_category.ngroups > 1
         )
 
         fig.add_hline(y=0, line_dash="solid", line_color="black", line_width=1)
@@ -528,10 +643,11 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(debounced_recent_months)
     def rolling_averages_plot():
         """Plot rolling averages for All-items inflation."""
         df = cpi_data.get()
@@ -539,59 +655,26 @@ def server(input, output, session):
             return ui.p("Loading...")
 
         # Get All-items data for the recent period
-        months = input.recent_months()
-        all_items = df[df['category'] == 'All-items'].copy()
-        all_items = all_items.sort_values('date')
+        months = debounced_recent_months()
+        all_items = category_frame(df, 'All-items')
 
         # Get recent data
         cutoff_date = all_items['date'].max() - pd.DateOffset(months=months)
         all_items = all_items[all_items['date'] >= cutoff_date]
 
-        fig = go.Figure()
-
-        # Add YoY line
-        fig.add_trace(go.Scatter(
-            x=all_items['date'],
-            y=all_items['yoy_change'],
-            name='YoY (Monthly)',
-            line=dict(color='lightgray', width=1),
-            opacity=0.5,
-            hovertemplate='YoY (Monthly): %{y:.2f}%<extra></extra>'
-        ))
-
-        # Add rolling averages
-        fig.add_trace(go.Scatter(
-            x=all_items['date'],
-            y=all_items['yoy_change_rolling_3m'],
-            name='3-Month Average',
-            line=dict(color='blue', width=2),
-            hovertemplate='3-Month Average: %{y:.2f}%<extra></extra>'
-        ))
-
-        fig.add_trace(go.Scatter(
-            x=all_items['date'],
-            y=all_items['yoy_change_rolling_6m'],
-            name='6-Month Average',
-            line=dict(color='orange', width=2),
-            hovertemplate='6-Month Average: %{y:.2f}%<extra></extra>'
-        ))
-
-        fig.add_trace(go.Scatter(
-            x=all_items['date'],
-            y=all_items['yoy_change_rolling_12m'],
-            name='12-Month Average',
-            line=dict(color='red', width=2, dash='dash'),
-            hovertemplate='12-Month Average: %{y:.2f}%<extra></extra>'
-        ))
-
-        fig.update_layout(
-            yaxis_title="Inflation Rate (%)",
-            xaxis_title="",
-            hovermode='x unified',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            height=350,
-            margin=dict(t=60, b=40)
-        )
+        # Fill the fixed set of traces directly rather than building a go.Figure
+        dates = all_items['date'].to_numpy()
+        data = [
+            dict(
+                type='scatter',
+                x=dates,
+                y=typed_array(all_items[column].to_numpy()),
+                name=name,
+                hovertemplate=f'{name}: %{{y:.2f}}%<extra></extra>',
+                **style
+            )
+            for column, name, style in _ROLLING_TRACES
+        ]
 
         config = {
             'responsive': True,
@@ -600,10 +683,11 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload({'data': data, 'layout': _ROLLING_LAYOUT}, config)
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache()
     def category_heatmap():
         """Create heatmap of recent inflation by key categories."""
         df = cpi_data.get()
@@ -636,21 +720,14 @@ def server(input, output, session):
         # Sort categories using our standard ordering
         sorted_categories = sort_categories(key_categories)
 
-        recent = df[
-            (df['date'] >= cutoff_date) &
-            (df['category'].isin(sorted_categories))
-        ].copy()
-
-        # Pivot to wide format for heatmap
-        heatmap_data = recent.pivot(index='category', columns='date', values='yoy_change')
-
-        # Reorder rows by sorted categories (reversed for bottom-to-top display)
-        heatmap_data = heatmap_data.reindex(sorted_categories[::-1])
+        # Category x month matrix, rows reversed for bottom-to-top display
+        heatmap_categories = sorted_categories[::-1]
+        z, months = get_yoy_matrix(df, heatmap_categories, start_date=cutoff_date)
 
         fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data.values,
-            x=[d.strftime('%b %Y') for d in heatmap_data.columns],
-            y=heatmap_data.index,
+            z=z,
+            x=months.strftime(SHORT_DATE_FORMAT).tolist(),
+            y=heatmap_categories,
             colorscale='RdYlGn_r',
             zmid=2.0,  # Center at 2% target
             colorbar=dict(title="YoY %"),
@@ -676,12 +753,7 @@ def server(input, output, session):
             'scrollZoom': False
         }
 
-        html_content = fig.to_html(include_plotlyjs=False, config=config)
-        return HTML(f'''
-<div class="heatmap-container" style="width: 100%; overflow-x: auto; -webkit-overflow-scrolling: touch; touch-action: pan-x pan-y;">
-    {html_content}
-</div>
-''')
+        return figure_payload(fig, config)
 
     # ===== HISTORICAL TAB =====
 
@@ -696,18 +768,13 @@ def server(input, output, session):
         if not categories:
             categories = ["All-items"]
 
-        date_range = input.historical_date_range()
+        date_range = debounced_historical_date_range()
         start_date = date_range[0].strftime("%Y-%m-%d") if date_range else None
         end_date = date_range[1].strftime("%Y-%m-%d") if date_range else None
 
-        result = get_historical_comparison(df, categories=categories)
-
-        if start_date:
-            result = result[result['date'] >= pd.to_datetime(start_date)]
-        if end_date:
-            result = result[result['date'] <= pd.to_datetime(end_date)]
-
-        return result
+        return get_historical_comparison(
+            df, categories=categories, start_date=start_date, end_date=end_date
+        )
 
     @output
     @render.ui
@@ -721,20 +788,16 @@ def server(input, output, session):
         if not categories:
             return None
 
-        date_range = input.historical_date_range()
-        start_date = date_range[0].strftime("%Y-%m-%d") if date_range else None
-        end_date = date_range[1].strftime("%Y-%m-%d") if date_range else None
+        # The historical data already holds these categories over the selected range
+        yoy = historical_data['yoy_change'].astype(np.float64)
+        summary = yoy.groupby(historical_data['category'], observed=True).agg(['mean', 'min', 'max', 'count'])
+        summary.columns = ['mean_yoy', 'min_yoy', 'max_yoy', 'count']
 
         stats_cards = []
         for category in categories:
-            stats = get_inflation_summary_stats(
-                cpi_data.get(),
-                category=category,
-                start_date=start_date,
-                end_date=end_date
-            )
+            stats = summary.loc[category].to_dict() if category in summary.index else {}
 
-            if stats:
+            if stats and stats['count'] > 0:
                 stats_cards.append(
                     ui.div(
                         ui.strong(category),
@@ -749,7 +812,8 @@ def server(input, output, session):
         return ui.div(*stats_cards, style="display: flex; flex-wrap: wrap;")
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(input.historical_categories, debounced_historical_date_range)
     def historical_cpi_plot():
         """Plot historical CPI values."""
         historical_data = get_historical_data()
@@ -760,14 +824,16 @@ def server(input, output, session):
         categories = historical_data['category'].unique().tolist()
         sorted_cats = sort_categories(categories)
 
+        # Cap points per line so long histories stay light to serialize and draw
         fig = px.line(
-            historical_data,
+            downsample_lines(historical_data, 'value'),
             x='date',
             y='value',
             color='category',
             title='Consumer Price Index (CPI) Over Time (Base 2002=100)',
             labels={'value': 'CPI Value', 'date': 'Date', 'category': 'Category'},
-            category_orders={'category': sorted_cats}
+            category_orders={'category': sorted_cats},
+            render_mode='webgl'
         )
 
         # Add custom hovertemplate to show full category names
@@ -785,10 +851,11 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(input.historical_categories, debounced_historical_date_range)
     def historical_yoy_plot():
         """Plot historical year-over-year inflation."""
         historical_data = get_historical_data()
@@ -799,14 +866,16 @@ def server(input, output, session):
         categories = historical_data['category'].unique().tolist()
         sorted_cats = sort_categories(categories)
 
+        # Cap points per line so long histories stay light to serialize and draw
         fig = px.line(
-            historical_data,
+            downsample_lines(historical_data, 'yoy_change'),
             x='date',
             y='yoy_change',
             color='category',
             title='Year-over-Year Inflation Rate (%)',
             labels={'yoy_change': 'YoY Change (%)', 'date': 'Date', 'category': 'Category'},
-            category_orders={'category': sorted_cats}
+            category_orders={'category': sorted_cats},
+            render_mode='webgl'
         )
 
         # Add custom hovertemplate to show full category names
@@ -826,10 +895,11 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(input.historical_categories, debounced_historical_date_range)
     def historical_cumulative_plot():
         """Plot cumulative inflation from start of period."""
         historical_data = get_historical_data()
@@ -838,35 +908,31 @@ def server(input, output, session):
         if historical_data is None or len(historical_data) == 0 or df is None:
             return ui.p("No data available")
 
-        date_range = input.historical_date_range()
+        date_range = debounced_historical_date_range()
         start_date = date_range[0].strftime("%Y-%m-%d") if date_range else None
 
         categories = list(input.historical_categories())
 
-        # Calculate cumulative inflation for each category
-        cumulative_data = []
-        for category in categories:
-            from ..models.inflation import calculate_cumulative_inflation
-            cat_cumulative = calculate_cumulative_inflation(df, category, start_date)
-            cumulative_data.append(cat_cumulative)
+        # Calculate cumulative inflation for all selected categories at once
+        combined = calculate_cumulative_inflation_by_category(df, categories, start_date)
 
-        if not cumulative_data:
+        if len(combined) == 0:
             return ui.p("No data available")
 
-        combined = pd.concat(cumulative_data, ignore_index=True)
-
         # Get sorted category order for legend
         categories_in_data = combined['category'].unique().tolist()
         sorted_cats = sort_categories(categories_in_data)
 
+        # Cap points per line so long histories stay light to serialize and draw
         fig = px.line(
-            combined,
+            downsample_lines(combined, 'cumulative_inflation'),
             x='date',
             y='cumulative_inflation',
             color='category',
             title='Cumulative Inflation from Start of Period (%)',
             labels={'cumulative_inflation': 'Cumulative Inflation (%)', 'date': 'Date', 'category': 'Category'},
-            category_orders={'category': sorted_cats}
+            category_orders={'category': sorted_cats},
+            render_mode='webgl'
         )
 
         # Add custom hovertemplate to show full category names
@@ -884,12 +950,13 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     # ===== DETAILED HEATMAP TAB =====
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(debounced_heatmap_months)
     def detailed_category_heatmap():
         """Create detailed heatmap of recent inflation by ALL categories."""
         df = cpi_data.get()
@@ -897,32 +964,21 @@ def server(input, output, session):
             return ui.p("Loading...")
 
         # Get months from input
-        months = input.heatmap_months()
+        months = debounced_heatmap_months()
         max_date = df['date'].max()
         cutoff_date = max_date - pd.DateOffset(months=months)
 
-        # Get all unique categories
-        all_categories = df['category'].unique().tolist()
-
-        # Sort categories using our standard ordering
-        sorted_categories = sort_categories(all_categories)
+        # All categories in our standard ordering
+        sorted_categories = all_categories_sorted()
 
-        # Filter data
-        recent = df[
-            (df['date'] >= cutoff_date) &
-            (df['category'].isin(sorted_categories))
-        ].copy()
-
-        # Pivot to wide format for heatmap
-        heatmap_data = recent.pivot(index='category', columns='date', values='yoy_change')
-
-        # Reorder rows by sorted categories (reversed for bottom-to-top display)
-        heatmap_data = heatmap_data.reindex(sorted_categories[::-1])
+        # Category x month matrix, rows reversed for bottom-to-top display
+        heatmap_categories = sorted_categories[::-1]
+        z, months = get_yoy_matrix(df, heatmap_categories, start_date=cutoff_date)
 
         fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data.values,
-            x=[d.strftime('%b %Y') for d in heatmap_data.columns],
-            y=heatmap_data.index,
+            z=z,
+            x=months.strftime(SHORT_DATE_FORMAT).tolist(),
+            y=heatmap_categories,
             colorscale='RdYlGn_r',
             zmid=2.0,  # Center at 2% target
             colorbar=dict(title="YoY %"),
@@ -948,12 +1004,7 @@ def server(input, output, session):
             'scrollZoom': False
         }
 
-        html_content = fig.to_html(include_plotlyjs=False, config=config)
-        return HTML(f'''
-<div class="heatmap-container" style="width: 100%; overflow-x: auto; -webkit-overflow-scrolling: touch; touch-action: pan-x pan-y;">
-    {html_content}
-</div>
-''')
+        return figure_payload(fig, config)
 
     # ===== CATEGORY BREAKDOWN TAB =====
 
@@ -964,23 +1015,22 @@ def server(input, output, session):
         if df is None:
             return None
 
-        breakdown_date = input.breakdown_date()
+        breakdown_date = debounced_breakdown_date()
         date_str = breakdown_date.strftime("%Y-%m-%d") if breakdown_date else None
 
         breakdown = get_category_breakdown(df, date=date_str)
 
-        # Apply sorting
+        # Apply sorting and limit to top N (YoY orders only need a partial sort)
         sort_by = input.breakdown_sort()
+        top_n = debounced_breakdown_top_n()
         if sort_by == "yoy_desc":
-            breakdown = breakdown.sort_values('yoy_change', ascending=False)
+            breakdown = breakdown.nlargest(top_n, 'yoy_change')
         elif sort_by == "yoy_asc":
-            breakdown = breakdown.sort_values('yoy_change', ascending=True)
-        elif sort_by == "category":
-            breakdown = breakdown.sort_values('category')
-
-        # Limit to top N
-        top_n = input.breakdown_top_n()
-        breakdown = breakdown.head(top_n)
+            breakdown = breakdown.nsmallest(top_n, 'yoy_change')
+        else:
+            if sort_by == "category":
+                breakdown = breakdown.sort_values('category')
+            breakdown = breakdown.head(top_n)
 
         return breakdown
 
@@ -992,7 +1042,7 @@ def server(input, output, session):
         if df is None:
             return ui.p("Loading...")
 
-        breakdown_date = input.breakdown_date()
+        breakdown_date = debounced_breakdown_date()
         date_str = format_date(breakdown_date) if breakdown_date else format_date(df['date'].max())
 
         return ui.div(
@@ -1001,7 +1051,8 @@ def server(input, output, session):
         )
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(debounced_breakdown_date, input.breakdown_sort, debounced_breakdown_top_n)
     def breakdown_bar_chart():
         """Display bar chart of category inflation rates."""
         breakdown = get_breakdown_data()
@@ -1049,7 +1100,7 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     @output
     @render.data_frame
@@ -1059,13 +1110,14 @@ def server(input, output, session):
         if breakdown is None:
             return None
 
-        table_data = breakdown[['category', 'value', 'yoy_change']].copy()
+        table_data = breakdown[['category', 'value', 'yoy_change']]
         table_data.columns = ['Category', 'Current CPI', 'YoY Inflation (%)']
 
         return render.DataGrid(table_data, width="100%", height="400px")
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(debounced_breakdown_date, input.breakdown_sort, debounced_breakdown_top_n)
     def breakdown_trends_plot():
         """Plot trends for top categories over last 12 months."""
         df = cpi_data.get()
@@ -1112,7 +1164,7 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     # ===== CUSTOM ANALYSIS TAB =====
 
@@ -1127,14 +1179,14 @@ def server(input, output, session):
         if not categories:
             categories = ["All-items"]
 
-        date_range = input.custom_date_range()
+        date_range = debounced_custom_date_range()
         start_date = date_range[0].strftime("%Y-%m-%d") if date_range else None
         end_date = date_range[1].strftime("%Y-%m-%d") if date_range else None
 
-        result = get_category_trends(df, start_date=start_date, end_date=end_date)
-        result = result[result['category'].isin(categories)]
-
-        return result
+        # Select the categories and date range straight from the frame index
+        return get_historical_comparison(
+            df, categories=categories, start_date=start_date, end_date=end_date
+        )
 
     @output
     @render.ui
@@ -1144,7 +1196,7 @@ def server(input, output, session):
         if custom_data is None or len(custom_data) == 0:
             return ui.p("No data available for selected filters")
 
-        date_range = input.custom_date_range()
+        date_range = debounced_custom_date_range()
         start = format_date_short(date_range[0]) if date_range else "Start"
         end = format_date_short(date_range[1]) if date_range else "End"
 
@@ -1155,7 +1207,8 @@ def server(input, output, session):
         )
 
     @output
-    @render.ui
+    @render_plotly
+    @figure_cache(input.custom_categories, debounced_custom_date_range)
     def custom_comparison_plot():
         """Plot custom data comparison."""
         custom_data = get_custom_data()
@@ -1166,14 +1219,16 @@ def server(input, output, session):
         categories_in_data = custom_data['category'].unique().tolist()
         sorted_cats = sort_categories(categories_in_data)
 
+        # Long custom ranges are reduced to at most MAX_POINTS per line
         fig = px.line(
-            custom_data,
+            downsample_lines(custom_data, 'yoy_change'),
             x='date',
             y='yoy_change',
             color='category',
             title='Year-over-Year Inflation Comparison',
             labels={'yoy_change': 'YoY Inflation (%)', 'date': 'Date', 'category': 'Category'},
-            category_orders={'category': sorted_cats}
+            category_orders={'category': sorted_cats},
+            render_mode='webgl'
         )
 
         # Add custom hovertemplate to show full category names
@@ -1191,26 +1246,27 @@ def server(input, output, session):
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
 
-        return HTML(fig.to_html(include_plotlyjs=False, config=config))
+        return figure_payload(fig, config)
 
     @output
     @render.ui
     def custom_stats_summary():
         """Display statistical summary for custom period."""
-        df = cpi_data.get()
         custom_data = get_custom_data()
 
-        if df is None or custom_data is None or len(custom_data) == 0:
+        if custom_data is None or len(custom_data) == 0:
             return ui.p("No data available")
 
-        categories = list(input.custom_categories())
-        date_range = input.custom_date_range()
-        start_date = date_range[0].strftime("%Y-%m-%d") if date_range else None
-        end_date = date_range[1].strftime("%Y-%m-%d") if date_range else None
+        # One pass over the already filtered custom data instead of one lookup per category
+        yoy = custom_data['yoy_change'].astype(np.float64)
+        summary = yoy.groupby(custom_data['category'], observed=True).agg(
+            ['mean', 'median', 'std', 'min', 'max', 'count']
+        )
+        summary.columns = ['mean_yoy', 'median_yoy', 'std_yoy', 'min_yoy', 'max_yoy', 'count']
 
         stats_cards = []
-        for category in categories:
-            stats = get_inflation_summary_stats(df, category, start_date, end_date)
+        for category in input.custom_categories():
+            stats = summary.loc[category].to_dict() if category in summary.index else {}
 
             if stats and stats.get('count', 0) > 0:
                 stats_cards.append(
@@ -1241,9 +1297,11 @@ def server(input, output, session):
         if custom_data is None:
             return None
 
-        table_data = custom_data[['date', 'category', 'value', 'yoy_change']].copy()
-        table_data['date'] = table_data['date'].apply(format_date_short)
-        table_data.columns = ['Date', 'Category', 'CPI', 'YoY %']
+        # Renamed selection with dates formatted in one pass; assign() leaves the
+        # shared data untouched
+        table_data = custom_data[['date', 'category', 'value', 'yoy_change']].rename(
+            columns={'date': 'Date', 'category': 'Category', 'value': 'CPI', 'yoy_change': 'YoY %'}
+        ).assign(Date=lambda d: d['Date'].dt.strftime(SHORT_DATE_FORMAT))
 
         return render.DataGrid(table_data, width="100%", height="400px")
 
@@ -1255,44 +1313,43 @@ def server(input, output, session):
         """Generate Excel report for download."""
         df = cpi_data.get()
         if df is None:
-            return None
+            return
 
         categories = list(input.custom_categories())
         date_range = input.custom_date_range()
         start_date = date_range[0].strftime("%Y-%m-%d") if date_range else None
         end_date = date_range[1].strftime("%Y-%m-%d") if date_range else None
 
-        excel_file = create_excel_report(
+        # Built once per data load and set of filters, then served from the cache
+        yield get_excel_report_bytes(
             df,
             categories=categories if categories else None,
             start_date=start_date,
             end_date=end_date
         )
 
-        return excel_file
-
     @output
     @render.download(filename="inflation_data.csv")
     def download_csv():
-        """Generate CSV data for download."""
+        """Stream CSV data for download."""
         df = cpi_data.get()
         if df is None:
-            return ""
+            return
 
         categories = list(input.custom_categories())
         date_range = input.custom_date_range()
         start_date = date_range[0].strftime("%Y-%m-%d") if date_range else None
         end_date = date_range[1].strftime("%Y-%m-%d") if date_range else None
 
-        csv_data = create_simple_csv_export(
+        # Yielded chunks are sent as they are written (a returned string
+        # would be taken as a file path)
+        yield from iter_csv_export(
             df,
             categories=categories if categories else None,
             start_date=start_date,
             end_date=end_date
         )
 
-        return csv_data
-
     # ===== DATA TABLE TAB =====
 
     @reactive.Effect
@@ -1308,9 +1365,9 @@ def server(input, output, session):
         if df is None:
             return
 
-        # Get unique dates and format as yyyy-mm
-        unique_dates = sorted(df['date'].unique(), reverse=True)
-        date_choices = [d.strftime('%Y-%m') for d in unique_dates]
+        # Distinct dates (kept by the frame index), latest first, formatted as yyyy-mm
+        months = get_frame_index(df).months[::-1]
+        date_choices = pd.DatetimeIndex(months).strftime('%Y-%m').tolist()
 
         # Update dropdown choices
         ui.update_select(
@@ -1325,24 +1382,13 @@ def server(input, output, session):
         )
 
     @reactive.Calc
-    def get_table_data():
-        """Get data formatted for wide-format table display."""
+    @figure_cache(input.table_date_from, input.table_date_to, input.table_value_type)
+    def get_table_pivot():
+        """Get all categories in wide format for the selected dates and value type."""
         df = cpi_data.get()
         if df is None:
             return None
 
-        # Apply date range filter using yyyy-mm selections
-        date_from = input.table_date_from()
-        date_to = input.table_date_to()
-
-        if date_from and date_to:
-            # Convert yyyy-mm to datetime for filtering
-            start_date = pd.to_datetime(date_from + "-01")
-            end_date = pd.to_datetime(date_to + "-01")
-
-            # Filter data
-            df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-
         # Select value column based on type
         value_type = input.table_value_type()
         if value_type == "cpi":
@@ -1352,28 +1398,35 @@ def server(input, output, session):
         else:  # mom
             value_col = 'mom_change'
 
-        # Pivot to wide format: categories as rows, dates as columns
-        wide_df = df.pivot(index='category', columns='date', values=value_col)
+        # Apply date range filter using yyyy-mm selections
+        date_from = input.table_date_from()
+        date_to = input.table_date_to()
+        start_date = date_from + "-01" if date_from and date_to else None
+        end_date = date_to + "-01" if date_from and date_to else None
+
+        # Wide format (categories as rows, dates as columns), sliced from the
+        # pivot cached with the metrics frame
+        wide_df = get_wide_table(df, value_col, start_date, end_date)
 
         # Format column names as YYYY-MM
-        wide_df.columns = [col.strftime('%Y-%m') for col in wide_df.columns]
+        wide_df = wide_df.set_axis(wide_df.columns.strftime('%Y-%m').rename(None), axis=1)
+
+        # Apply category ordering - priority categories first, then alphabetical
+        sorted_categories = sort_categories(wide_df.index.tolist())
+        wide_df = wide_df.reindex(sorted_categories)
 
         # Reset index to make category a column
         wide_df = wide_df.reset_index()
 
-        # Apply category ordering - priority categories first, then alphabetical
-        categories = wide_df['category'].tolist()
-        sorted_categories = sort_categories(categories)
-
-        # Create a categorical type with the sorted order
-        wide_df['category'] = pd.Categorical(
-            wide_df['category'],
-            categories=sorted_categories,
-            ordered=True
-        )
+        return wide_df
 
-        # Sort by category using the custom ordering
-        wide_df = wide_df.sort_values('category').reset_index(drop=True)
+    @reactive.Calc
+    def get_table_data():
+        """Get data formatted for wide-format table display."""
+        # The pivot is cached per date range and value type; only the focus filter runs here
+        wide_df = get_table_pivot()
+        if wide_df is None:
+            return None
 
         # Apply letter range filter
         focus_filter = input.table_focus_filter()
@@ -1395,17 +1448,13 @@ def server(input, output, session):
             if focus_filter in letter_ranges:
                 start_letter, end_letter = letter_ranges[focus_filter]
 
-                # Filter function to check if category is in range
-                def in_letter_range(category):
-                    # Always include priority categories
-                    if category in PRIORITY_CATEGORIES:
-                        return True
-                    # Check if first letter is in range
-                    first_letter = category[0].upper()
-                    return start_letter <= first_letter <= end_letter
+                # Always include priority categories, otherwise check the first letter
+                names = wide_df['category'].astype(str)
+                first_letters = names.str[0].str.upper()
+                in_range = names.isin(PRIORITY_CATEGORIES) | first_letters.between(start_letter, end_letter)
 
                 # Apply filter
-                wide_df = wide_df[wide_df['category'].apply(in_letter_range)].reset_index(drop=True)
+                wide_df = wide_df[in_range].reset_index(drop=True)
 
         return wide_df
 
@@ -1418,54 +1467,44 @@ def server(input, output, session):
             return ui.p("No data available")
 
         # Round numeric columns to 1 decimal place for better readability
-        numeric_cols = table_data.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            table_data[col] = table_data[col].round(1)
+        # (into a new frame; the table data is cached and shared)
+        table_data = table_data.round(1)
 
         # Build HTML table with right-aligned numeric columns
         from ..utils.formatting import PRIORITY_CATEGORIES
 
-        # Create header row
-        header_cells = []
+        # Header row: category column left-aligned, dates right-aligned (see CSS below)
+        header_html = "<tr>" + "".join(f"<th>{col}</th>" for col in table_data.columns) + "</tr>"
+
+        # Row classes: priority categories highlighted, others alternating
+        categories = table_data['category'].astype(str).to_numpy()
+        is_priority = np.isin(categories, PRIORITY_CATEGORIES)
+        non_priority_idx = np.cumsum(~is_priority) - 1
+        row_classes = np.where(
+            is_priority,
+            ' class="priority"',
+            np.where(non_priority_idx % 2 == 0, ' class="alt"', "")
+        )
+
+        # Numeric cells, formatted a column at a time (missing values left blank)
+        value_columns = []
         for col in table_data.columns:
             if col == 'category':
-                header_cells.append(f'<th style="text-align: left; position: sticky; left: 0; background-color: #f8f9fa; z-index: 10; padding: 8px; border-bottom: 2px solid #dee2e6;">{col}</th>')
-            else:
-                # Right-align date headers
-                header_cells.append(f'<th style="text-align: right; padding: 8px; border-bottom: 2px solid #dee2e6; white-space: nowrap;">{col}</th>')
-
-        header_html = f'<tr>{"".join(header_cells)}</tr>'
-
-        # Create data rows
-        rows_html = []
-        for idx, row in table_data.iterrows():
-            category = row['category']
-
-            # Determine row background color
-            if category in PRIORITY_CATEGORIES:
-                bg_color = "#e3f2fd"  # Light blue for priority categories
-            else:
-                # Alternating colors for non-priority
-                non_priority_idx = idx - len([c for c in table_data['category'][:idx] if c in PRIORITY_CATEGORIES])
-                bg_color = "#f5f5f5" if non_priority_idx % 2 == 0 else "#ffffff"
-
-            cells = []
-            for col in table_data.columns:
-                value = row[col]
-                if col == 'category':
-                    # Category column - left-aligned, sticky
-                    cells.append(f'<td style="text-align: left; position: sticky; left: 0; background-color: {bg_color}; z-index: 5; padding: 8px; border-bottom: 1px solid #dee2e6; font-weight: 500;">{value}</td>')
-                else:
-                    # Numeric columns - right-aligned
-                    display_value = f"{value:.1f}" if pd.notna(value) else ""
-                    cells.append(f'<td style="text-align: right; padding: 8px; border-bottom: 1px solid #dee2e6;">{display_value}</td>')
-
-            rows_html.append(f'<tr style="background-color: {bg_color};">{"".join(cells)}</tr>')
+                continue
+            values = table_data[col].to_numpy(dtype=np.float64)
+            formatted = np.where(np.isnan(values), "", np.char.mod("%.1f", values))
+            value_columns.append([f"<td>{text}</td>" for text in formatted])
+
+        # Styling lives in the CSS block, so each row carries at most a class name
+        rows_html = [
+            f'<tr{row_class}><td>{category}</td>{"".join(cells)}</tr>'
+            for category, row_class, cells in zip(categories, row_classes, zip(*value_columns))
+        ]
 
         table_html = f'''
         <div style="width: 100%; height: 600px; overflow: auto; border: 1px solid #dee2e6; border-radius: 4px; -webkit-overflow-scrolling: touch;">
-            <table style="width: 100%; border-collapse: collapse; font-family: monospace; font-size: 13px; min-width: max-content;">
-                <thead style="position: sticky; top: 0; background-color: #f8f9fa; z-index: 10;">
+            <table class="cpi-wide">
+                <thead>
                     {header_html}
                 </thead>
                 <tbody>
@@ -1474,6 +1513,35 @@ def server(input, output, session):
             </table>
         </div>
         <style>
+            #wide_format_table table.cpi-wide {{
+                width: 100%; border-collapse: collapse; font-family: monospace;
+                font-size: 13px; min-width: max-content;
+            }}
+            #wide_format_table .cpi-wide thead {{
+                position: sticky; top: 0; background-color: #f8f9fa; z-index: 10;
+            }}
+            #wide_format_table .cpi-wide th {{
+                text-align: right; padding: 8px; border-bottom: 2px solid #dee2e6; white-space: nowrap;
+            }}
+            #wide_format_table .cpi-wide th:first-child {{
+                text-align: left; position: sticky; left: 0; background-color: #f8f9fa; z-index: 10;
+            }}
+            #wide_format_table .cpi-wide td {{
+                text-align: right; padding: 8px; border-bottom: 1px solid #dee2e6;
+            }}
+            #wide_format_table .cpi-wide tbody tr {{
+                background-color: #ffffff;
+            }}
+            #wide_format_table .cpi-wide tbody tr.alt {{
+                background-color: #f5f5f5;
+            }}
+            #wide_format_table .cpi-wide tbody tr.priority {{
+                background-color: #e3f2fd;  /* Light blue for priority categories */
+            }}
+            #wide_format_table .cpi-wide td:first-child {{
+                text-align: left; position: sticky; left: 0; background-color: inherit;
+                z-index: 5; font-weight: 500;
+            }}
             @media (max-width: 768px) {{
                 /* Mobile: reduce font size and padding */
                 #wide_format_table table {{
@@ -1491,16 +1559,12 @@ def server(input, output, session):
     @output
     @render.download(filename="cpi_table_data.csv")
     def download_table_csv():
-        """Download wide-format table as CSV."""
+        """Stream the wide-format table as CSV for download."""
         table_data = get_table_data()
         if table_data is None:
-            return ""
-
-        # Convert to CSV
-        csv_buffer = io.StringIO()
-        table_data.to_csv(csv_buffer, index=False)
+            return
 
-        return csv_buffer.getvalue()
+        yield from iter_csv_chunks(table_data)
 
     # =========================================================================
     # Research Tab - PDF Download
@@ -0,0 +1,69 @@
+"""
+Debounced Reactive Values
+
+Shiny for Python has no built-in debounce, so sliders and date pickers
+invalidate every dependent calculation on each intermediate value while
+they are being dragged. debounce() wraps a reactive read so dependents only
+see a new value once it has stopped changing for a short delay.
+"""
+
+import time
+from typing import Any, Callable
+
+from shiny import reactive
+
+
+def debounce(delay_secs: float) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """
+    Create a decorator that debounces a reactive read.
+
+    Must be used inside a session (e.g. in the server function), since it
+    creates session-scoped reactive effects. The first value is available
+    immediately; later changes are passed on once the value has been stable
+    for delay_secs.
+
+    Example:
+        recent_months = debounce(0.25)(input.recent_months)
+
+    Args:
+        delay_secs: Quiet period required before a new value is passed on
+
+    Returns:
+        Decorator turning a reactive read into a debounced one
+    """
+    def decorator(read: Callable[[], Any]) -> Callable[[], Any]:
+        # Unset until a value can be read, so dependents wait like they would on the input
+        value = reactive.Value()
+        deadline = reactive.Value(None)
+
+        with reactive.isolate():
+            try:
+                value.set(read())
+            except Exception:
+                pass
+
+        @reactive.Effect(priority=102)
+        def _watch():
+            # Restart the quiet period whenever the underlying value changes
+            read()
+            deadline.set(time.monotonic() + delay_secs)
+
+        @reactive.Effect(priority=101)
+        def _timer():
+            due = deadline()
+            if due is None:
+                return
+
+            remaining = due - time.monotonic()
+            if remaining > 0:
+                reactive.invalidate_later(remaining)
+                return
+
+            with reactive.isolate():
+                deadline.set(None)
+                # Setting the same object again does not invalidate dependents
+                value.set(read())
+
+        return value.get
+
+    return decorator
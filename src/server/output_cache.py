@@ -0,0 +1,86 @@
+"""
+Rendered Output Cache
+
+Per-session memoization of rendered outputs (Plotly figure HTML and the
+like), keyed by the output name, the loaded data version and the input
+values the output depends on. Toggling an input back to an earlier value,
+or re-rendering after an unrelated invalidation, then returns the stored
+result instead of rebuilding and re-serializing the figure.
+"""
+
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+def _freeze(value: Any) -> Hashable:
+    """Make an input value usable as part of a cache key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class OutputCache:
+    """
+    Least-recently-used cache for rendered outputs.
+
+    Use an instance as a decorator factory, listing every input the output
+    reads. The inputs and the data version are read on each call, so the
+    output keeps its reactive dependencies even when the render function
+    itself is skipped.
+
+    Example:
+        @output
+        @render.ui
+        @figure_cache(input.recent_months, input.recent_categories)
+        def recent_yoy_plot():
+            ...
+    """
+
+    def __init__(self, version: Callable[[], Hashable], maxsize: int = 64):
+        """
+        Args:
+            version: Returns an identifier for the currently loaded data
+            maxsize: Maximum number of cached outputs
+        """
+        self._version = version
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def clear(self):
+        """Drop all cached outputs."""
+        self._entries.clear()
+
+    def __call__(self, *inputs: Callable[[], Any]) -> Callable:
+        """
+        Decorate a render function so its result is cached per input values.
+
+        Args:
+            *inputs: Input accessors (e.g. input.recent_months) covering
+                everything the render function reads
+
+        Returns:
+            Decorator for the render function
+        """
+        def decorator(fn: Callable[[], Any]) -> Callable[[], Any]:
+            @functools.wraps(fn)
+            def wrapper():
+                key = (fn.__name__, self._version()) + tuple(_freeze(read()) for read in inputs)
+
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+
+                result = fn()
+                self._entries[key] = result
+                if len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+                return result
+
+            return wrapper
+
+        return decorator
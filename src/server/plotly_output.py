@@ -0,0 +1,81 @@
+"""
+Plotly Figure Output (server side)
+
+Renderer that sends Plotly figures to the browser as JSON rather than as
+standalone HTML fragments. The matching output container and client-side
+binding live in src/ui/plotly_output.py.
+
+Render functions return figure_payload(fig, config), which serializes the
+figure once so the result can be cached as is, or any UI content (such as a
+loading message) to show in place of the chart.
+"""
+
+import base64
+from typing import Any, Union
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from htmltools import TagList
+from shiny.render.renderer import Renderer
+
+from ..ui.plotly_output import output_plotly
+
+
+def figure_payload(fig: Union[go.Figure, dict], config: dict) -> dict:
+    """
+    Serialize a figure for a render_plotly output.
+
+    Args:
+        fig: Figure to draw, or a plain {'data': ..., 'layout': ...} figure
+            dictionary, which is serialized without validation
+        config: Plotly config options (mode bar, responsiveness, ...)
+
+    Returns:
+        Dictionary with the figure JSON and config
+    """
+    if isinstance(fig, dict):
+        return {'figure': pio.to_json(fig, validate=False), 'config': config}
+    return {'figure': fig.to_json(), 'config': config}
+
+
+def typed_array(values: np.ndarray) -> dict:
+    """
+    Encode a numeric array as a plotly.js typed array (base64 data).
+
+    This is the encoding go.Figure applies to NumPy arrays, for use in plain
+    figure dictionaries.
+
+    Args:
+        values: Numeric array
+
+    Returns:
+        Typed array spec with 'dtype' and 'bdata' keys
+    """
+    # plotly.js reads typed arrays as little-endian
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    return {
+        'dtype': values.dtype.str[1:],
+        'bdata': base64.b64encode(values.tobytes()).decode('ascii'),
+    }
+
+
+class render_plotly(Renderer[Any]):
+    """
+    Render a Plotly figure payload with Plotly.react on the client.
+
+    Example:
+        @output
+        @render_plotly
+        def recent_yoy_plot():
+            ...
+            return figure_payload(fig, config)
+    """
+
+    def auto_output_ui(self):
+        return output_plotly(self.output_id)
+
+    async def transform(self, value: Any) -> dict:
+        if isinstance(value, dict):
+            return value
+        return {'html': TagList(value).get_html_string()}
@@ -13,6 +13,8 @@ Four main tabs:
 
 from shiny import ui
 
+from .plotly_output import output_plotly, plotly_output_binding
+
 
 def create_header_panel():
     """Create the header panel with refresh button and last updated info."""
@@ -134,7 +136,7 @@ def create_recent_trends_tab():
 
             # Main Inflation Chart
             ui.h4("Year-over-Year Inflation Rate"),
-            ui.output_ui("recent_yoy_plot"),
+            output_plotly("recent_yoy_plot"),
 
             # Base Effects Analysis (conditional)
             ui.output_ui("base_effects_section"),
@@ -146,12 +148,12 @@ def create_recent_trends_tab():
                 ui.column(
                     6,
                     ui.h4("Inflation Acceleration/Deceleration"),
-                    ui.output_ui("inflation_acceleration_plot"),
+                    output_plotly("inflation_acceleration_plot"),
                 ),
                 ui.column(
                     6,
                     ui.h4("Rolling Averages (All-items)"),
-                    ui.output_ui("rolling_averages_plot"),
+                    output_plotly("rolling_averages_plot"),
                 ),
             ),
 
@@ -159,7 +161,7 @@ def create_recent_trends_tab():
 
             # Category Heatmap
             ui.h4("Recent Inflation by Category (Last 12 Months)"),
-            ui.output_ui("category_heatmap"),
+            output_plotly("category_heatmap", class_="heatmap-container", style="touch-action: pan-x pan-y;"),
         )
     )
 
@@ -207,13 +209,13 @@ def create_historical_tab():
             ),
             ui.hr(),
             ui.h4("Year-over-Year Inflation Rate"),
-            ui.output_ui("historical_yoy_plot"),
+            output_plotly("historical_yoy_plot"),
             ui.hr(),
             ui.h4("Cumulative Inflation Since Start of Period"),
-            ui.output_ui("historical_cumulative_plot"),
+            output_plotly("historical_cumulative_plot"),
             ui.hr(),
             ui.h4("CPI Index Over Time"),
-            ui.output_ui("historical_cpi_plot"),
+            output_plotly("historical_cpi_plot"),
         )
     )
 
@@ -256,13 +258,13 @@ def create_category_breakdown_tab():
             ),
             ui.hr(),
             ui.h4("Category Inflation Rates"),
-            ui.output_ui("breakdown_bar_chart"),
+            output_plotly("breakdown_bar_chart"),
             ui.hr(),
             ui.h4("Detailed Category Table"),
             ui.output_data_frame("breakdown_table"),
             ui.hr(),
             ui.h4("Category Trends (Last 12 Months)"),
-            ui.output_ui("breakdown_trends_plot"),
+            output_plotly("breakdown_trends_plot"),
         )
     )
 
@@ -313,7 +315,7 @@ def create_custom_analysis_tab():
             ),
             ui.hr(),
             ui.h4("Inflation Comparison"),
-            ui.output_ui("custom_comparison_plot"),
+            output_plotly("custom_comparison_plot"),
             ui.hr(),
             ui.h4("Statistical Summary"),
             ui.output_ui("custom_stats_summary"),
@@ -345,7 +347,7 @@ def create_detailed_heatmap_tab():
             ),
             ui.h3("Detailed Inflation Heatmap by Category"),
             ui.p("Year-over-year inflation rates for all categories. Color scale centered at 2% (Bank of Canada target)."),
-            ui.output_ui("detailed_category_heatmap"),
+            output_plotly("detailed_category_heatmap", class_="heatmap-container", style="touch-action: pan-x pan-y;"),
         )
     )
 
@@ -554,6 +556,8 @@ app_ui = ui.page_navbar(
         """),
         # Load Plotly library globally for all charts (version must match what Plotly Python generates)
         ui.tags.script(src="https://cdn.plot.ly/plotly-3.2.0.min.js", integrity="sha256-iZ2u/oU2wf/vDbl/ChcX93WgbBRSBvUO6N413hDz7xM=", crossorigin="anonymous"),
+        # Output binding that draws figures sent as JSON (see src/ui/plotly_output.py)
+        plotly_output_binding,
         create_header_panel(),
         ui.tags.style("""
             .page-header {
@@ -0,0 +1,65 @@
+"""
+Plotly Figure Output (client side)
+
+Output container and Shiny output binding for figures sent as JSON by the
+render_plotly renderer (src/server/plotly_output.py). The binding draws each
+update with Plotly.react, which diffs against the chart already on the page
+instead of replacing the output's HTML and re-initializing the plot.
+"""
+
+from typing import Optional
+from shiny import ui
+
+
+def output_plotly(id: str, class_: Optional[str] = None, **kwargs) -> ui.Tag:
+    """
+    Create a container for a render_plotly output.
+
+    Args:
+        id: Output ID (name of the render function)
+        class_: Optional extra CSS classes for the container
+        **kwargs: Extra attributes for the container div
+
+    Returns:
+        Div bound to the Plotly output binding
+    """
+    classes = "plotly-output" if class_ is None else f"plotly-output {class_}"
+    return ui.div(id=id, class_=classes, **kwargs)
+
+
+# Registered inline (like the favicon script) so no static files need serving
+plotly_output_binding = ui.tags.script("""
+    (function() {
+        var binding = new Shiny.OutputBinding();
+
+        $.extend(binding, {
+            find: function(scope) {
+                return $(scope).find('.plotly-output');
+            },
+            renderValue: function(el, value) {
+                var graph = el.querySelector(':scope > .plotly-graph');
+
+                // Placeholder content (loading / no data messages)
+                if (!value || value.figure === undefined) {
+                    if (graph) {
+                        Plotly.purge(graph);
+                    }
+                    el.innerHTML = value ? value.html : '';
+                    return;
+                }
+
+                if (!graph) {
+                    el.innerHTML = '';
+                    graph = document.createElement('div');
+                    graph.className = 'plotly-graph';
+                    el.appendChild(graph);
+                }
+
+                var figure = JSON.parse(value.figure);
+                Plotly.react(graph, figure.data, figure.layout, value.config);
+            }
+        });
+
+        Shiny.outputBindings.register(binding, 'statscan.plotlyOutput');
+    })();
+""")
@@ -0,0 +1,113 @@
+"""
+Time-Series Downsampling
+
+Largest-Triangle-Three-Buckets (LTTB) downsampling for long line traces.
+Long histories are reduced to a fixed number of points before plotting so the
+serialized figure and the browser's draw cost stay bounded, while peaks,
+troughs and the overall shape of each line are preserved.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Maximum points per plotted line
+MAX_POINTS = 1000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int = MAX_POINTS) -> np.ndarray:
+    """
+    Select the points of a series that best preserve its visual shape.
+
+    The first and last points are always kept. The rest are split into
+    n_out - 2 buckets and from each bucket the point forming the largest
+    triangle with the previously selected point and the average of the next
+    bucket is kept.
+
+    Args:
+        x: Ascending x values (numeric or datetime64)
+        y: Finite y values
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted integer positions of the kept points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[s]').astype(np.int64)
+    x = x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket boundaries over the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_start = end if next_end > end else n - 1
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Twice the triangle area for each candidate in this bucket
+        px, py = x[selected], y[selected]
+        areas = np.abs(
+            (px - avg_x) * (y[start:end] - py) - (px - x[start:end]) * (avg_y - py)
+        )
+        selected = start + int(np.argmax(areas))
+        kept[i + 1] = selected
+
+    return kept
+
+
+def downsample_lines(
+    df: pd.DataFrame,
+    y: str,
+    x: str = 'date',
+    by: str = 'category',
+    n_out: int = MAX_POINTS
+) -> pd.DataFrame:
+    """
+    Downsample every line of a long-format DataFrame to at most n_out points.
+
+    Lines that are already short enough are kept whole. Rows with a missing
+    y value are always kept so gaps in a line still show as gaps.
+
+    Args:
+        df: Long-format data, ordered by x within each line
+        y: Column plotted on the y axis
+        x: Column plotted on the x axis
+        by: Column identifying each line
+        n_out: Maximum number of points per line
+
+    Returns:
+        DataFrame with the kept rows in their original order
+    """
+    groups = df.groupby(by, observed=True, sort=False).indices
+    if all(len(rows) <= n_out for rows in groups.values()):
+        return df
+
+    xs = df[x].to_numpy()
+    ys = df[y].to_numpy(dtype=np.float64)
+
+    keep = []
+    for rows in groups.values():
+        if len(rows) <= n_out:
+            keep.append(rows)
+            continue
+
+        finite = np.isfinite(ys[rows])
+        points = rows[finite]
+        keep.append(rows[~finite])
+        keep.append(points[lttb_indices(xs[points], ys[points], n_out)])
+
+    return df.iloc[np.sort(np.concatenate(keep))]
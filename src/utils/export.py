@@ -5,13 +5,58 @@ Functions to create formatted Excel workbooks with inflation analysis results.
 """
 
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import io
-from datetime import datetime
-from typing import Optional
+import re
+from collections import OrderedDict
+from typing import Iterator, Optional
 import logging
 
+from ..data.frame_index import FrameCache, date_mask, peek_frame_index, take_rows
+
 logger = logging.getLogger(__name__)
 
+# Rows per chunk when streaming CSV exports
+CSV_CHUNK_ROWS = 10000
+
+# Characters that make to_csv quote a text field
+CSV_QUOTE_PATTERN = r'[",\r\n]'
+
+# Number format pandas gives datetime cells by default
+DATETIME_NUM_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+# Finished Excel reports per metrics frame, keyed by filters (least recently used first)
+_report_cache = FrameCache()
+REPORT_CACHE_SIZE = 8
+
+
+def _filter_export_rows(
+    df: pd.DataFrame,
+    categories: Optional[list],
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> pd.DataFrame:
+    """
+    Select the rows of an export, keeping the frame's row order.
+
+    Rows are located through the frame index (a binary search per category)
+    when one is already cached, and with a boolean mask otherwise.
+    """
+    index = peek_frame_index(df)
+    if index is None:
+        # Rows without a category are left out, as the index does
+        mask = date_mask(df['date'], start_date or None, end_date or None)
+        if categories:
+            mask &= df['category'].isin(categories).to_numpy()
+        else:
+            mask &= df['category'].notna().to_numpy()
+        return df[mask]
+
+    rows = index.rows(categories or None, start=start_date or None, end=end_date or None)
+    return take_rows(df, np.sort(rows))
+
 
 def create_excel_report(
     df: pd.DataFrame,
@@ -34,16 +79,7 @@ def create_excel_report(
     logger.info("Creating Excel report...")
 
     # Filter data
-    export_df = df.copy()
-
-    if categories:
-        export_df = export_df[export_df['category'].isin(categories)]
-
-    if start_date:
-        export_df = export_df[export_df['date'] >= pd.to_datetime(start_date)]
-
-    if end_date:
-        export_df = export_df[export_df['date'] <= pd.to_datetime(end_date)]
+    export_df = _filter_export_rows(df, categories, start_date, end_date)
 
     # Create BytesIO object
     output = io.BytesIO()
@@ -96,13 +132,85 @@ def create_excel_report(
         _create_category_breakdown_sheet(writer, export_df, header_format, percent_format)
 
         # Sheet 5: Data Dictionary
-        _create_data_dictionary_sheet(writer, header_format)
+        _create_data_dictionary_sheet(writer, export_df, header_format)
 
     output.seek(0)
     logger.info("Excel report created successfully")
     return output
 
 
+def get_excel_report_bytes(
+    df: pd.DataFrame,
+    categories: Optional[list] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> bytes:
+    """
+    Get the Excel report for a set of filters, reusing a previously built one.
+
+    The last REPORT_CACHE_SIZE reports are kept with the metrics frame, so
+    repeated downloads with the same filters (from any session) skip
+    rebuilding the workbook, and new data starts with an empty cache. The
+    sheets show no export timestamp, so a cached report never goes stale.
+
+    Args:
+        df: CPI DataFrame with inflation metrics
+        categories: Optional list of categories to include (None = all)
+        start_date: Optional start date filter (YYYY-MM-DD)
+        end_date: Optional end date filter (YYYY-MM-DD)
+
+    Returns:
+        Excel file contents
+    """
+    reports = _report_cache.get(df)
+    if reports is None:
+        reports = _report_cache.set(df, OrderedDict())
+
+    # Row selection does not depend on the order categories were picked in
+    key = (tuple(sorted(categories)) if categories else None, start_date or None, end_date or None)
+    if key in reports:
+        reports.move_to_end(key)
+        return reports[key]
+
+    report = create_excel_report(df, categories, start_date, end_date).getvalue()
+    reports[key] = report
+    if len(reports) > REPORT_CACHE_SIZE:
+        reports.popitem(last=False)
+    return report
+
+
+def _write_data_sheet(writer, sheet_name, df, header_format):
+    """
+    Write a long data sheet column by column.
+
+    Same cells as DataFrame.to_excel (missing values left empty, dates with
+    pandas' default datetime format), but written with typed xlsxwriter calls
+    instead of pandas building and styling every cell separately, which
+    dominates export time for the full history.
+    """
+    workbook = writer.book
+    worksheet = workbook.add_worksheet(sheet_name)
+    datetime_format = workbook.add_format({'num_format': DATETIME_NUM_FORMAT})
+
+    worksheet.write_row(0, 0, list(df.columns), header_format)
+
+    for col_num, column in enumerate(df.columns):
+        values = df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            for row, value in enumerate(values.dt.to_pydatetime(), start=1):
+                if not pd.isna(value):
+                    worksheet.write_datetime(row, col_num, value, datetime_format)
+        elif pd.api.types.is_numeric_dtype(values):
+            numbers = values.to_numpy(dtype=np.float64)
+            present = ~np.isnan(numbers)
+            for row, value in zip((np.flatnonzero(present) + 1).tolist(), numbers[present].tolist()):
+                worksheet.write_number(row, col_num, value)
+        else:
+            worksheet.write_column(1, col_num, values.astype(str).tolist())
+
+    return worksheet
+
+
 def _create_summary_sheet(writer, df, header_format, title_format):
     """Create summary statistics sheet."""
     from ..models.inflation import get_latest_inflation_rate, get_inflation_summary_stats
@@ -160,13 +268,7 @@ def _create_recent_data_sheet(writer, df, header_format, date_format, number_for
     recent_df = recent_df.sort_values(['Date', 'Category'], ascending=[False, True])
 
     # Write to sheet
-    recent_df.to_excel(writer, sheet_name='Recent Trends (24M)', index=False, startrow=0)
-
-    worksheet = writer.sheets['Recent Trends (24M)']
-
-    # Format header row
-    for col_num, value in enumerate(recent_df.columns.values):
-        worksheet.write(0, col_num, value, header_format)
+    worksheet = _write_data_sheet(writer, 'Recent Trends (24M)', recent_df, header_format)
 
     # Set column widths and formats
     worksheet.set_column('A:A', 12)
@@ -188,13 +290,7 @@ def _create_full_data_sheet(writer, df, header_format, date_format, number_forma
     full_df = full_df.sort_values(['Category', 'Date'])
 
     # Write to sheet
-    full_df.to_excel(writer, sheet_name='Historical Data', index=False, startrow=0)
-
-    worksheet = writer.sheets['Historical Data']
-
-    # Format header row
-    for col_num, value in enumerate(full_df.columns.values):
-        worksheet.write(0, col_num, value, header_format)
+    worksheet = _write_data_sheet(writer, 'Historical Data', full_df, header_format)
 
     # Set column widths and formats
     worksheet.set_column('A:A', 12)
@@ -240,8 +336,8 @@ def _create_category_breakdown_sheet(writer, df, header_format, percent_format):
     })
 
 
-def _create_data_dictionary_sheet(writer, header_format):
-    """Create data dictionary explaining the metrics."""
+def _create_data_dictionary_sheet(writer, df, header_format):
+    """Create data dictionary explaining the metrics and the period covered."""
     dictionary_data = [
         ['Metric', 'Description'],
         ['CPI Value', 'Consumer Price Index value (base year 2002=100)'],
@@ -273,43 +369,117 @@ def _create_data_dictionary_sheet(writer, header_format):
     worksheet.write('A10', 'Data Source:', header_format)
     worksheet.write('B10', 'Statistics Canada Table 18-10-0004-01')
 
-    worksheet.write('A11', 'Export Date:', header_format)
-    worksheet.write('B11', datetime.now().strftime('%Y-%m-%d %H:%M'))
+    latest_date = df['date'].max()
+    worksheet.write('A11', 'Data Through:', header_format)
+    worksheet.write('B11', latest_date.strftime('%B %Y') if pd.notna(latest_date) else '')
 
 
-def create_simple_csv_export(
+def _csv_field(values: pd.Series) -> pa.Array:
+    """Format one column as DataFrame.to_csv does, with nulls for missing values."""
+    # astype(str) is the formatting to_csv itself uses ("100.0", "1e-07", dates at midnight)
+    text = pa.array(values.astype(str), from_pandas=True, type=pa.string())
+    if values.dtype.kind in 'biufmM':
+        return text
+
+    # Quote only text that needs it, doubling embedded quotes
+    quoted = pc.binary_join_element_wise('"', pc.replace_substring(text, '"', '""'), '"', '')
+    return pc.if_else(pc.match_substring_regex(text, CSV_QUOTE_PATTERN), quoted, text)
+
+
+def _csv_header(columns) -> str:
+    """Header row with column names quoted like to_csv."""
+    names = []
+    for name in map(str, columns):
+        if re.search(CSV_QUOTE_PATTERN, name):
+            name = '"' + name.replace('"', '""') + '"'
+        names.append(name)
+    return ','.join(names) + '\n'
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Write a DataFrame as CSV with pyarrow compute kernels, one chunk at a time.
+
+    Output matches DataFrame.to_csv(index=False) byte for byte. Arrow's own
+    CSV writer quotes every text value, so rows are joined with Arrow
+    string kernels instead.
+    Only one chunk exists at a time, so large exports can be sent as they
+    are written instead of being built as one string first.
+
+    Args:
+        df: DataFrame to write
+        chunk_rows: Number of rows per yielded chunk
+
+    Yields:
+        UTF-8 CSV data, starting with the header row
+    """
+    yield _csv_header(df.columns).encode('utf-8')
+
+    # Timestamps drop the time only if the whole column is at midnight, so format them up front
+    dates = {name: _csv_field(df[name]) for name in df.columns if df[name].dtype.kind == 'M'}
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        fields = [
+            dates[name].slice(start, chunk_rows) if name in dates else _csv_field(chunk[name])
+            for name in chunk.columns
+        ]
+        lines = pc.binary_join_element_wise(
+            *fields, ',', null_handling='replace', null_replacement=''
+        )
+
+        # The csv module quotes a row made of one empty field
+        if len(fields) == 1:
+            lines = pc.if_else(pc.equal(lines, ''), '""', lines)
+
+        rows = pa.ListArray.from_arrays(pa.array([0, len(lines)], pa.int32()), lines)
+        yield (pc.binary_join(rows, '\n')[0].as_py() + '\n').encode('utf-8')
+
+
+def iter_csv_export(
     df: pd.DataFrame,
     categories: Optional[list] = None,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
-) -> str:
+    end_date: Optional[str] = None,
+    chunk_rows: int = CSV_CHUNK_ROWS
+) -> Iterator[bytes]:
     """
-    Create a simple CSV export of filtered data.
+    Stream a simple CSV export of filtered data in chunks.
 
     Args:
         df: CPI DataFrame with inflation metrics
         categories: Optional list of categories to include
         start_date: Optional start date filter (YYYY-MM-DD)
         end_date: Optional end date filter (YYYY-MM-DD)
+        chunk_rows: Number of rows per yielded chunk
 
-    Returns:
-        CSV string
+    Yields:
+        UTF-8 CSV data, starting with the header row
     """
     # Filter data
-    export_df = df.copy()
+    export_df = _filter_export_rows(df, categories, start_date, end_date)
 
-    if categories:
-        export_df = export_df[export_df['category'].isin(categories)]
+    # Select columns
+    columns = ['date', 'category', 'value', 'mom_change', 'yoy_change']
+    yield from iter_csv_chunks(export_df[columns], chunk_rows)
 
-    if start_date:
-        export_df = export_df[export_df['date'] >= pd.to_datetime(start_date)]
 
-    if end_date:
-        export_df = export_df[export_df['date'] <= pd.to_datetime(end_date)]
+def create_simple_csv_export(
+    df: pd.DataFrame,
+    categories: Optional[list] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> str:
+    """
+    Create a simple CSV export of filtered data.
 
-    # Select columns
-    columns = ['date', 'category', 'value', 'mom_change', 'yoy_change']
-    export_df = export_df[columns]
+    Args:
+        df: CPI DataFrame with inflation metrics
+        categories: Optional list of categories to include
+        start_date: Optional start date filter (YYYY-MM-DD)
+        end_date: Optional end date filter (YYYY-MM-DD)
 
-    # Convert to CSV
-    return export_df.to_csv(index=False)
+    Returns:
+        CSV string
+    """
+    return b"".join(iter_csv_export(df, categories, start_date, end_date)).decode('utf-8')
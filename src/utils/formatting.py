@@ -5,7 +5,8 @@ Functions for formatting numbers, dates, and percentages for display.
 """
 
 import pandas as pd
-from typing import Optional, Union, List
+from functools import lru_cache
+from typing import FrozenSet, Optional, Union, List, Tuple
 
 
 # CRITICAL: Category ordering convention
@@ -20,6 +21,22 @@ PRIORITY_CATEGORIES = [
 ]
 
 
+# strftime format of format_date_short, for formatting whole date columns at once
+SHORT_DATE_FORMAT = "%b %Y"
+
+# Position of each priority category, for sorting
+_PRIORITY_RANK = {cat: i for i, cat in enumerate(PRIORITY_CATEGORIES)}
+
+
+@lru_cache(maxsize=64)
+def _sort_category_set(categories: FrozenSet[str]) -> Tuple[str, ...]:
+    """Sort a set of categories once; plots and tables keep asking for the same few sets."""
+    return tuple(sorted(
+        categories,
+        key=lambda cat: (0, _PRIORITY_RANK[cat], "") if cat in _PRIORITY_RANK else (1, 0, cat)
+    ))
+
+
 def sort_categories(categories: List[str]) -> List[str]:
     """
     Sort categories according to the standard convention.
@@ -32,22 +49,17 @@ def sort_categories(categories: List[str]) -> List[str]:
     Returns:
         Sorted list of categories
     """
-    priority = []
-    others = []
-
-    for cat in categories:
-        if cat in PRIORITY_CATEGORIES:
-            priority.append(cat)
-        else:
-            others.append(cat)
-
-    # Sort priority categories by their defined order
-    priority_sorted = sorted(priority, key=lambda x: PRIORITY_CATEGORIES.index(x))
+    categories = list(categories)
+    category_set = frozenset(categories)
 
-    # Sort other categories alphabetically
-    others_sorted = sorted(others)
+    # Repeated names would collapse in the cached set, so sort those directly
+    if len(category_set) != len(categories):
+        priority = sorted(
+            (cat for cat in categories if cat in _PRIORITY_RANK), key=_PRIORITY_RANK.__getitem__
+        )
+        return priority + sorted(cat for cat in categories if cat not in _PRIORITY_RANK)
 
-    return priority_sorted + others_sorted
+    return list(_sort_category_set(category_set))
 
 
 def create_category_choices_dict(categories: List[str]) -> dict:
@@ -155,7 +167,7 @@ def format_date_short(date: Union[pd.Timestamp, str]) -> str:
     Returns:
         Formatted date string (e.g., "Jan 2024")
     """
-    return format_date(date, "%b %Y")
+    return format_date(date, SHORT_DATE_FORMAT)
 
 
 def format_date_range(
@@ -0,0 +1,478 @@
+"""
+Unit tests for conditional downloads into the CPI cache, CSV parsing,
+the rendered output cache and debounced inputs
+"""
+
+import asyncio
+import io
+import os
+import json
+import time
+import zipfile
+import pytest
+import pandas as pd
+import sys
+import types
+from pathlib import Path
+from shiny import reactive
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data import cache, loader
+from src.server import debounce as debounce_module
+from src.server.output_cache import OutputCache
+
+
+def _make_zip(values) -> bytes:
+    """Build a Statistics Canada style ZIP with one category over a few months."""
+    lines = ['REF_DATE,GEO,DGUID,Products and product groups,UOM,VALUE']
+    for i, value in enumerate(values):
+        lines.append(f'2024-{i + 1:02d},Canada,2016A000011124,All-items,2002=100,{value}')
+        lines.append(f'2024-{i + 1:02d},Ontario,2016A000235,All-items,2002=100,{value + 1}')
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        zip_file.writestr('18100004.csv', '\n'.join(lines))
+        zip_file.writestr('18100004_MetaData.csv', 'Cube Title\nConsumer Price Index\n')
+    return buffer.getvalue()
+
+
+def _make_csv(rows) -> bytes:
+    """Build a Statistics Canada style CSV from (REF_DATE, GEO, category, VALUE) rows."""
+    lines = ['REF_DATE,GEO,DGUID,Products and product groups,UOM,VALUE']
+    for ref_date, geo, category, value in rows:
+        lines.append(f'{ref_date},{geo},2016A000011124,"{category}",2002=100,{value}')
+    return '\n'.join(lines).encode('utf-8-sig')
+
+
+def _parse_with_pandas(csv_data) -> pd.DataFrame:
+    """The original parse_statscan_csv: per-row date parsing and regex, for comparison."""
+    df = pd.read_csv(io.BytesIO(csv_data), encoding='utf-8-sig', low_memory=False)
+    df = df[df['GEO'] == 'Canada'].copy()
+    df = df[['REF_DATE', 'Products and product groups', 'VALUE']].copy()
+    df.columns = ['date', 'category', 'value']
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m')
+    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    df = df.dropna()
+    df = df[~df['category'].str.contains(r'\(19\d{2}=100\)', na=False, regex=True)]
+    return df.sort_values(['category', 'date']).reset_index(drop=True)
+
+
+def _assert_parsed_like_pandas(csv_data):
+    """Check parse_statscan_csv against the original, up to category and float32 dtypes."""
+    result = loader.parse_statscan_csv(csv_data)
+    expected = _parse_with_pandas(csv_data)
+
+    pd.testing.assert_frame_equal(
+        result.assign(category=result['category'].astype(str)),
+        expected.assign(value=expected['value'].astype('float32'))
+    )
+    return result
+
+
+class FakeResponse:
+    """Minimal streamed requests.Response stand-in."""
+
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise loader.requests.HTTPError(f'{self.status_code} Error')
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class FakeSession:
+    """Replays queued responses and records the request headers sent."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+class UnchangedSession(FakeSession):
+    """Answers 304 to any conditional request, like a server whose table is unchanged."""
+
+    def __init__(self, zip_data):
+        super().__init__()
+        self.zip_data = zip_data
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        if headers:
+            return FakeResponse(304)
+        return FakeResponse(200, self.zip_data, {'ETag': '"v1"'})
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory with no legacy cache."""
+    monkeypatch.setattr(cache, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(cache, 'CACHE_FILE', tmp_path / 'cpi_data_cache.parquet')
+    monkeypatch.setattr(cache, 'CACHE_META', tmp_path / 'cpi_data_cache.meta.json')
+    monkeypatch.setattr(cache, 'CACHE_ZIP_HASH', tmp_path / '.last_zip_hash')
+    monkeypatch.setattr(cache, 'LEGACY_CACHE_FILE', tmp_path / 'legacy' / 'missing.parquet')
+    return tmp_path
+
+
+def _use_session(monkeypatch, *responses) -> FakeSession:
+    """Replace the loader's HTTP session with one replaying the given responses."""
+    session = FakeSession(*responses)
+    monkeypatch.setattr(loader, '_SESSION', session)
+    return session
+
+
+def _count_parses(monkeypatch) -> list:
+    """Wrap parse_statscan_zip to record how often the ZIP is parsed."""
+    calls = []
+    parse = loader.parse_statscan_zip
+
+    def counting_parse(zip_data):
+        calls.append(len(zip_data))
+        return parse(zip_data)
+
+    monkeypatch.setattr(loader, 'parse_statscan_zip', counting_parse)
+    return calls
+
+
+def _age_cache_file():
+    """Backdate the cache file so a later touch is visible."""
+    old = time.time() - 3 * 86400
+    os.utime(cache.CACHE_FILE, (old, old))
+    return old
+
+
+class TestDownloadToCache:
+    """Test _download_to_cache() with 200, 304 and unchanged-ZIP responses."""
+
+    def test_first_download(self, cache_dir, monkeypatch):
+        """Test an unconditional download writes the cache and both sidecars."""
+        zip_data = _make_zip([100.0, 101.0, 102.0])
+        session = _use_session(monkeypatch, FakeResponse(
+            200, zip_data, {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+        ))
+
+        df = cache._download_to_cache()
+
+        # No validators yet, so the request is unconditional
+        assert session.requests == [{}]
+        assert list(df['value']) == [100.0, 101.0, 102.0]
+        assert cache.CACHE_FILE.exists()
+
+        meta = json.loads(cache.CACHE_META.read_text())
+        assert meta['etag'] == '"v1"'
+        assert meta['last_modified'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+        assert cache.CACHE_ZIP_HASH.read_text() == cache._zip_digest(zip_data)
+
+    def test_not_modified(self, cache_dir, monkeypatch):
+        """Test a 304 reuses the cache and extends its validity without parsing."""
+        _use_session(monkeypatch, FakeResponse(200, _make_zip([100.0, 101.0]), {'ETag': '"v1"'}))
+        cache._download_to_cache()
+        old = _age_cache_file()
+
+        session = _use_session(monkeypatch, FakeResponse(304))
+        parses = _count_parses(monkeypatch)
+        df = cache._download_to_cache()
+
+        assert session.requests == [{'If-None-Match': '"v1"'}]
+        assert parses == []
+        assert list(df['value']) == [100.0, 101.0]
+        assert cache.CACHE_FILE.stat().st_mtime > old
+
+    def test_not_modified_unreadable_cache(self, cache_dir, monkeypatch):
+        """Test a 304 with a corrupt cache falls back to an unconditional download."""
+        _use_session(monkeypatch, FakeResponse(200, _make_zip([100.0]), {'ETag': '"v1"'}))
+        cache._download_to_cache()
+        cache.CACHE_FILE.write_bytes(b'not parquet')
+
+        session = _use_session(
+            monkeypatch, FakeResponse(304), FakeResponse(200, _make_zip([105.0]), {'ETag': '"v2"'})
+        )
+        df = cache._download_to_cache()
+
+        assert session.requests == [{'If-None-Match': '"v1"'}, {}]
+        assert list(df['value']) == [105.0]
+        assert json.loads(cache.CACHE_META.read_text())['etag'] == '"v2"'
+
+    def test_same_zip_skips_parse(self, cache_dir, monkeypatch):
+        """Test a 200 with byte-identical content reuses the cache but records new validators."""
+        zip_data = _make_zip([100.0, 101.0])
+        _use_session(monkeypatch, FakeResponse(200, zip_data, {'ETag': '"v1"'}))
+        cache._download_to_cache()
+        old = _age_cache_file()
+
+        _use_session(monkeypatch, FakeResponse(200, zip_data, {'ETag': '"v2"'}))
+        parses = _count_parses(monkeypatch)
+        df = cache._download_to_cache()
+
+        assert parses == []
+        assert list(df['value']) == [100.0, 101.0]
+        assert cache.CACHE_FILE.stat().st_mtime > old
+        assert json.loads(cache.CACHE_META.read_text())['etag'] == '"v2"'
+
+    def test_changed_zip_reparsed(self, cache_dir, monkeypatch):
+        """Test a 200 with new content is parsed and replaces the cache and hash."""
+        _use_session(monkeypatch, FakeResponse(200, _make_zip([100.0]), {'ETag': '"v1"'}))
+        cache._download_to_cache()
+
+        new_zip = _make_zip([100.0, 103.0])
+        _use_session(monkeypatch, FakeResponse(200, new_zip, {'ETag': '"v2"'}))
+        parses = _count_parses(monkeypatch)
+        df = cache._download_to_cache()
+
+        assert parses == [len(new_zip)]
+        assert list(df['value']) == [100.0, 103.0]
+        assert list(cache.load_from_cache()['value']) == [100.0, 103.0]
+        assert cache.CACHE_ZIP_HASH.read_text() == cache._zip_digest(new_zip)
+
+    def test_clear_cache_removes_sidecars(self, cache_dir, monkeypatch):
+        """Test clearing the cache also forgets the validators and ZIP hash."""
+        _use_session(monkeypatch, FakeResponse(200, _make_zip([100.0]), {'ETag': '"v1"'}))
+        cache._download_to_cache()
+
+        cache.clear_cache()
+
+        assert not cache.CACHE_FILE.exists()
+        assert not cache.CACHE_META.exists()
+        assert not cache.CACHE_ZIP_HASH.exists()
+        assert cache.load_cache_meta() == {}
+
+
+class TestForceRefresh:
+    """Test that a forced refresh always re-parses the download."""
+
+    def test_force_refresh_ignores_validators(self, cache_dir, monkeypatch):
+        """Test a forced refresh is unconditional, so the server cannot answer 304."""
+        zip_data = _make_zip([100.0, 101.0])
+        session = UnchangedSession(zip_data)
+        monkeypatch.setattr(loader, '_SESSION', session)
+        cache._download_to_cache()
+
+        # A normal refresh is conditional and reuses the cache
+        parses = _count_parses(monkeypatch)
+        cache._download_to_cache()
+        assert session.requests[-1] == {'If-None-Match': '"v1"'}
+        assert parses == []
+
+        df = cache.get_cached_or_download(force_refresh=True)
+
+        assert session.requests[-1] == {}
+        assert parses == [len(zip_data)]
+        assert list(df['value']) == [100.0, 101.0]
+
+    def test_force_refresh_ignores_zip_hash(self, cache_dir, monkeypatch):
+        """Test a forced refresh re-parses a ZIP identical to the cached one."""
+        zip_data = _make_zip([100.0, 101.0])
+        _use_session(monkeypatch, FakeResponse(200, zip_data, {'ETag': '"v1"'}))
+        cache._download_to_cache()
+
+        # Simulate a cache written by an older parser
+        cache.save_to_cache(cache.load_from_cache().assign(value=[1.0, 2.0]))
+
+        _use_session(monkeypatch, FakeResponse(200, zip_data, {'ETag': '"v1"'}))
+        parses = _count_parses(monkeypatch)
+        df = cache.get_cached_or_download(force_refresh=True)
+
+        assert parses == [len(zip_data)]
+        assert list(df['value']) == [100.0, 101.0]
+        assert list(cache.load_from_cache()['value']) == [100.0, 101.0]
+
+
+class TestParseStatscanCsv:
+    """Test parse_statscan_csv() against the original pandas implementation."""
+
+    def test_deprecated_base_years_dropped(self):
+        """Test categories on a pre-2002 base are removed, including from the categories."""
+        csv_data = _make_csv([
+            ('2024-01', 'Canada', 'Food', 101.3),
+            ('2024-01', 'Canada', 'Food (1992=100)', 5),
+            ('2024-01', 'Canada', 'Energy (1986=100)', 7),
+            ('2024-01', 'Canada', 'Rent (2002=100)', 120.5),
+            ('2024-01', 'Canada', 'Clothing (1999=100 basket)', 88.0),
+            ('2024-02', 'Canada', 'Food', 102.1),
+            ('2024-02', 'Ontario', 'Shelter (1992=100)', 3),
+        ])
+
+        result = _assert_parsed_like_pandas(csv_data)
+
+        assert list(result['category'].cat.categories) == [
+            'Clothing (1999=100 basket)', 'Food', 'Rent (2002=100)'
+        ]
+
+    def test_dates_parsed_once_per_month(self):
+        """Test unordered, repeated months with missing values and a month only outside Canada."""
+        csv_data = _make_csv([
+            ('2024-02', 'Canada', 'All-items', 160.2),
+            ('2023-12', 'Canada', 'Food', '..'),
+            ('2024-01', 'Canada', 'Food', 101.3),
+            ('1914-01', 'Canada', 'All-items', 6.0),
+            ('2023-12', 'Canada', 'All-items', ''),
+            ('2023-11', 'Ontario', 'Food', 9),
+            ('2024-01', 'Canada', 'All-items', 159.9),
+            ('2024-02', 'Canada', 'Food', 102.1),
+        ])
+
+        result = _assert_parsed_like_pandas(csv_data)
+
+        assert list(result['date'].dt.strftime('%Y-%m')) == [
+            '1914-01', '2024-01', '2024-02', '2024-01', '2024-02'
+        ]
+
+
+def _cached_plot(version, maxsize=64):
+    """Decorate a counting render function reading two stand-in inputs."""
+    inputs = {'months': 12, 'categories': ['Food', 'Shelter']}
+    renders = []
+    figure_cache = OutputCache(lambda: version[0], maxsize=maxsize)
+
+    @figure_cache(lambda: inputs['months'], lambda: inputs['categories'])
+    def recent_plot():
+        renders.append((inputs['months'], tuple(inputs['categories'])))
+        return f'figure {len(renders)}'
+
+    return recent_plot, inputs, renders, figure_cache
+
+
+class TestOutputCache:
+    """Test per-input memoization of rendered outputs."""
+
+    def test_repeated_inputs_hit(self):
+        """Test a render is reused when the inputs return to an earlier value."""
+        recent_plot, inputs, renders, _ = _cached_plot([1])
+
+        first = recent_plot()
+        inputs['months'] = 24
+        second = recent_plot()
+        inputs['months'] = 12
+
+        assert recent_plot() == first
+        assert second != first
+        assert len(renders) == 2
+        assert recent_plot.__name__ == 'recent_plot'
+
+    def test_list_inputs_compared_by_value(self):
+        """Test unhashable inputs are keyed by their contents."""
+        recent_plot, inputs, renders, _ = _cached_plot([1])
+
+        recent_plot()
+        inputs['categories'] = ['Food', 'Shelter']
+        recent_plot()
+        inputs['categories'] = ['Shelter', 'Food']
+        recent_plot()
+
+        assert len(renders) == 2
+
+    def test_data_version_and_clear(self):
+        """Test a new data version or clear() forces a re-render."""
+        version = [1]
+        recent_plot, _, renders, figure_cache = _cached_plot(version)
+
+        recent_plot()
+        version[0] = 2
+        recent_plot()
+        figure_cache.clear()
+        recent_plot()
+
+        assert len(renders) == 3
+
+    def test_least_recently_used_evicted(self):
+        """Test the oldest unused output is dropped once maxsize is exceeded."""
+        recent_plot, inputs, renders, _ = _cached_plot([1], maxsize=2)
+
+        for months in [12, 24, 12, 36]:
+            inputs['months'] = months
+            recent_plot()
+
+        # 12 was used more recently than 24, so 24 was evicted
+        inputs['months'] = 12
+        recent_plot()
+        inputs['months'] = 24
+        recent_plot()
+
+        assert [months for months, _ in renders] == [12, 24, 36, 24]
+
+
+@pytest.fixture
+def fake_timers(monkeypatch):
+    """Drive debounce() with a manual clock and record scheduled invalidations."""
+    clock = {'now': 100.0}
+    pending = []
+
+    def invalidate_later(delay):
+        pending.append(reactive.get_current_context())
+
+    def advance(seconds):
+        """Move the clock on, fire the due timers and run the reactive graph."""
+        clock['now'] += seconds
+        while pending:
+            pending.pop().invalidate()
+        asyncio.run(reactive.flush())
+
+    fake_time = types.SimpleNamespace(monotonic=lambda: clock['now'])
+    monkeypatch.setattr(debounce_module, 'time', fake_time)
+    monkeypatch.setattr(reactive, 'invalidate_later', invalidate_later)
+    return advance
+
+
+class TestDebounce:
+    """Test that debounced reads only pass on values once they settle."""
+
+    def test_value_passed_on_after_quiet_period(self, fake_timers):
+        """Test intermediate values are skipped and the settled one is seen once."""
+        source = reactive.Value(1)
+        read = debounce_module.debounce(0.25)(source.get)
+        seen = []
+
+        @reactive.effect
+        def _record():
+            seen.append(read())
+
+        fake_timers(0)
+        assert seen == [1]
+
+        # Dragging: each change restarts the quiet period
+        for value in [2, 3, 4]:
+            source.set(value)
+            fake_timers(0.1)
+        assert seen == [1]
+
+        fake_timers(0.3)
+        assert seen == [1, 4]
+
+        # The same value again does not re-run dependents
+        fake_timers(1.0)
+        assert seen == [1, 4]
+
+    def test_return_to_first_value(self, fake_timers):
+        """Test a change that settles back on the current value does not re-run dependents."""
+        source = reactive.Value('2024-01')
+        read = debounce_module.debounce(0.25)(source.get)
+        seen = []
+
+        @reactive.effect
+        def _record():
+            seen.append(read())
+
+        fake_timers(0)
+        source.set('2024-02')
+        fake_timers(0.1)
+        source.set('2024-01')
+        fake_timers(0.3)
+
+        assert seen == ['2024-01']
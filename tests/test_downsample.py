@@ -0,0 +1,93 @@
+"""
+Unit tests for LTTB downsampling
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.downsample import lttb_indices, downsample_lines
+
+
+@pytest.fixture
+def long_cpi_data():
+    """Create two long monthly lines with a spike and a few missing values."""
+    dates = pd.date_range(start='1914-01-01', periods=1300, freq='MS')
+    rng = np.random.default_rng(0)
+
+    data = []
+    for category in ['All-items', 'Food']:
+        values = 100 + np.cumsum(rng.normal(0, 0.5, len(dates)))
+        data.append(pd.DataFrame({'date': dates, 'category': category, 'value': values}))
+
+    df = pd.concat(data, ignore_index=True)
+    df.loc[500, 'value'] = 1000.0
+    df.loc[[10, 11, 1400], 'value'] = np.nan
+    return df
+
+
+class TestLTTBIndices:
+    """Test point selection for a single series."""
+
+    @pytest.mark.parametrize('n_out', [3, 10, 250, 999])
+    def test_output_size_and_endpoints(self, n_out):
+        """Test exactly n_out distinct, sorted points including the first and last."""
+        x = np.arange(1000)
+        y = np.sin(x / 20.0)
+
+        kept = lttb_indices(x, y, n_out)
+
+        assert len(kept) == n_out
+        assert kept[0] == 0
+        assert kept[-1] == len(x) - 1
+        assert np.all(np.diff(kept) > 0)
+
+    @pytest.mark.parametrize('n_out', [100, 101, 500])
+    def test_short_input_unchanged(self, n_out):
+        """Test that series at or below the threshold are kept whole."""
+        x = np.arange(100)
+
+        np.testing.assert_array_equal(lttb_indices(x, x * 2.0, n_out), np.arange(100))
+
+    def test_datetime_x_keeps_extremes(self):
+        """Test datetime x values and that a lone spike survives."""
+        x = pd.date_range(start='2000-01-01', periods=500, freq='D').to_numpy()
+        y = np.zeros(500)
+        y[123] = 50.0
+        y[321] = -50.0
+
+        kept = lttb_indices(x, y, 20)
+
+        assert len(kept) == 20
+        assert 123 in kept
+        assert 321 in kept
+
+
+class TestDownsampleLines:
+    """Test downsampling of long-format line data."""
+
+    def test_short_lines_pass_through(self, long_cpi_data):
+        """Test that data within the limit is returned as-is."""
+        assert downsample_lines(long_cpi_data, 'value', n_out=1300) is long_cpi_data
+
+    def test_lines_reduced(self, long_cpi_data):
+        """Test each line is reduced while keeping gaps, spikes and row order."""
+        result = downsample_lines(long_cpi_data, 'value', n_out=200)
+
+        counts = result['value'].notna().groupby(result['category']).sum()
+        assert (counts == 200).all()
+
+        # Missing values are kept so gaps still show
+        assert result['value'].isna().sum() == 3
+        assert 500 in result.index
+        assert result.index.is_monotonic_increasing
+
+        for category, line in result.groupby('category'):
+            source = long_cpi_data[long_cpi_data['category'] == category]
+            assert line['date'].iloc[0] == source['date'].iloc[0]
+            assert line['date'].iloc[-1] == source['date'].iloc[-1]
@@ -0,0 +1,124 @@
+"""
+Unit tests for Excel and CSV exports
+"""
+
+import io
+import pytest
+import pandas as pd
+import numpy as np
+import openpyxl
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.inflation import add_all_inflation_metrics
+from src.utils import export
+
+
+@pytest.fixture
+def metrics_data():
+    """Create a small CPI frame with inflation metrics."""
+    dates = pd.date_range(start='2022-01-01', end='2024-01-01', freq='MS')
+
+    data = []
+    for c, category in enumerate(['All-items', 'Food', 'Shelter']):
+        for i, date in enumerate(dates):
+            data.append({
+                'date': date,
+                'category': category,
+                'value': 100 + c + i * 0.5
+            })
+
+    return add_all_inflation_metrics(pd.DataFrame(data))
+
+
+@pytest.fixture
+def counted_builds(monkeypatch):
+    """Replace the workbook builder with a cheap one that records its calls."""
+    builds = []
+
+    def fake_report(df, categories=None, start_date=None, end_date=None):
+        builds.append((categories, start_date, end_date))
+        return io.BytesIO(f'report {len(builds)}'.encode())
+
+    monkeypatch.setattr(export, 'create_excel_report', fake_report)
+    return builds
+
+
+class TestExcelReportCache:
+    """Test reuse of built Excel reports."""
+
+    def test_repeat_download_reuses_report(self, metrics_data, counted_builds):
+        """Test the same filters, in any category order, build the report once."""
+        first = export.get_excel_report_bytes(metrics_data, ['Food', 'Shelter'], '2023-01-01')
+        second = export.get_excel_report_bytes(metrics_data, ['Shelter', 'Food'], '2023-01-01')
+
+        assert second is first
+        assert len(counted_builds) == 1
+
+        # Different filters are a different report
+        export.get_excel_report_bytes(metrics_data, ['Food'], '2023-01-01')
+        assert len(counted_builds) == 2
+
+    def test_least_recently_used_evicted(self, metrics_data, counted_builds, monkeypatch):
+        """Test only the most recently used reports are kept."""
+        monkeypatch.setattr(export, 'REPORT_CACHE_SIZE', 2)
+
+        export.get_excel_report_bytes(metrics_data, ['Food'])
+        export.get_excel_report_bytes(metrics_data, ['Shelter'])
+        export.get_excel_report_bytes(metrics_data, ['Food'])
+        export.get_excel_report_bytes(metrics_data, ['All-items'])
+        assert len(counted_builds) == 3
+
+        # Food was used more recently than Shelter, so Shelter was dropped
+        export.get_excel_report_bytes(metrics_data, ['Food'])
+        assert len(counted_builds) == 3
+        export.get_excel_report_bytes(metrics_data, ['Shelter'])
+        assert len(counted_builds) == 4
+
+    def test_new_data_rebuilds(self, metrics_data, counted_builds):
+        """Test a newly loaded frame does not reuse reports built from the old one."""
+        first = export.get_excel_report_bytes(metrics_data)
+        second = export.get_excel_report_bytes(metrics_data.copy())
+
+        assert second != first
+        assert len(counted_builds) == 2
+
+    def test_report_has_no_export_timestamp(self, metrics_data):
+        """Test the workbook only holds values derived from the data."""
+        report = export.get_excel_report_bytes(metrics_data, ['Food'], end_date='2023-06-01')
+
+        sheet = openpyxl.load_workbook(io.BytesIO(report))['Data Dictionary']
+        assert sheet['A11'].value == 'Data Through:'
+        assert sheet['B11'].value == 'June 2023'
+
+
+class TestCsvExport:
+    """Test the streamed CSV export against DataFrame.to_csv."""
+
+    COLUMNS = ['date', 'category', 'value', 'mom_change', 'yoy_change']
+
+    def test_matches_to_csv(self, metrics_data):
+        """Test the joined chunks equal to_csv(index=False) on the same rows."""
+        expected = metrics_data[self.COLUMNS].to_csv(index=False).encode()
+
+        assert b''.join(export.iter_csv_export(metrics_data, chunk_rows=10)) == expected
+
+    def test_awkward_values(self):
+        """Test quoting, missing values, float32, whole numbers, tiny values and times."""
+        df = pd.DataFrame({
+            # Only the last chunk has a time, but the whole column is written with times
+            'date': pd.to_datetime(
+                ['2024-01-01', '2024-02-01', '2024-03-01 12:00:00'], format='ISO8601'
+            ),
+            'category': pd.Categorical(['All-items', 'Food, "fresh"', 'Line\nbreak']),
+            'value': [100.0, 101.5, np.nan],
+            'mom_change': np.array([np.nan, 1.2345678, 1e-7], dtype=np.float32),
+            'yoy_change': [1e-5, -0.0, 2.0],
+        })
+
+        result = b''.join(export.iter_csv_chunks(df, chunk_rows=2))
+
+        assert result == df.to_csv(index=False).encode()
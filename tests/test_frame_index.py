@@ -0,0 +1,234 @@
+"""
+Unit tests for the category/date row index and frame caches
+"""
+
+import gc
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.frame_index import (
+    FrameCache,
+    FrameIndex,
+    discard_frame,
+    get_frame_index,
+    peek_frame_index,
+    take_rows,
+)
+from src.data.loader import filter_by_category, filter_by_date_range
+from src.models.inflation import calculate_mom_change
+from src.utils.export import _filter_export_rows
+
+
+@pytest.fixture
+def shuffled_cpi_data():
+    """Create CPI data in no particular row order, with a missing category."""
+    dates = pd.date_range(start='2022-01-01', periods=24, freq='MS')
+    categories = ['Shelter', 'All-items', 'Food']
+
+    data = []
+    for c, category in enumerate(categories):
+        for i, date in enumerate(dates):
+            data.append({
+                'date': date,
+                'category': category,
+                'value': 100 + c * 10 + i
+            })
+
+    df = pd.DataFrame(data).sample(frac=1, random_state=0).reset_index(drop=True)
+    df.loc[5, 'category'] = None
+    return df
+
+
+def _expected_rows(df, categories=None, start=None, end=None):
+    """Row positions of the matching rows in (category, date) order, via masks."""
+    mask = df['category'].notna()
+    if categories is not None:
+        mask &= df['category'].isin(categories)
+    if start is not None:
+        mask &= df['date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df['date'] <= pd.Timestamp(end)
+
+    positions = pd.Series(np.arange(len(df)), index=df.index)[mask]
+    ordered = df[mask].assign(_pos=positions).sort_values(['category', 'date'], kind='stable')
+    return ordered['_pos'].to_numpy()
+
+
+class TestFrameIndex:
+    """Test row lookups against boolean masks."""
+
+    def test_rows_all(self, shuffled_cpi_data):
+        """Test that all rows come back in (category, date) order without missing categories."""
+        index = FrameIndex(shuffled_cpi_data)
+
+        np.testing.assert_array_equal(index.rows(), _expected_rows(shuffled_cpi_data))
+        assert index.categories == ['All-items', 'Food', 'Shelter']
+
+    @pytest.mark.parametrize('categories,start,end', [
+        (['Food'], None, None),
+        (['Shelter', 'Food'], '2022-06-01', None),
+        (None, None, '2022-03-15'),
+        (['All-items', 'Missing'], '2022-02-01', '2023-05-01'),
+        (['Food'], '2023-06-01', '2022-01-01'),
+    ])
+    def test_rows_filtered(self, shuffled_cpi_data, categories, start, end):
+        """Test category and inclusive date range selection."""
+        index = FrameIndex(shuffled_cpi_data)
+
+        np.testing.assert_array_equal(
+            index.rows(categories, start=start, end=end),
+            _expected_rows(shuffled_cpi_data, categories, start, end)
+        )
+
+    def test_date_lookups(self, shuffled_cpi_data):
+        """Test date range rows, distinct months, the last date and absent categories."""
+        index = FrameIndex(shuffled_cpi_data)
+
+        rows = index.date_rows('2022-03-01', '2022-04-01')
+        assert len(rows) == 6
+        assert shuffled_cpi_data['date'].iloc[rows].is_monotonic_increasing
+
+        assert len(index.months) == 24
+        assert index.last_date == pd.Timestamp('2023-12-01')
+        assert len(index.cat_rows('Missing')) == 0
+
+
+class TestTakeRows:
+    """Test position-based row selection."""
+
+    def test_contiguous_rows_slice(self, shuffled_cpi_data):
+        """Test that a run of consecutive positions is served as a slice."""
+        result = take_rows(shuffled_cpi_data, np.arange(3, 9))
+
+        pd.testing.assert_frame_equal(result, shuffled_cpi_data.iloc[3:9])
+        assert np.shares_memory(
+            result['value'].to_numpy(), shuffled_cpi_data['value'].to_numpy()
+        )
+
+    @pytest.mark.parametrize('rows', [[8, 3, 4], [3, 3, 4], [4, 3], [0, 2, 3], [7]])
+    def test_other_rows_gather(self, shuffled_cpi_data, rows):
+        """Test that unordered, repeated or gapped positions match iloc."""
+        rows = np.array(rows)
+
+        pd.testing.assert_frame_equal(
+            take_rows(shuffled_cpi_data, rows), shuffled_cpi_data.iloc[rows]
+        )
+
+    def test_empty_rows(self, shuffled_cpi_data):
+        """Test selecting no rows."""
+        assert len(take_rows(shuffled_cpi_data, np.empty(0, dtype=np.intp))) == 0
+
+
+class TestFrameCache:
+    """Test identity-keyed caching and its invalidation."""
+
+    def test_get_set(self, shuffled_cpi_data):
+        """Test values are cached per frame object."""
+        cache = FrameCache()
+
+        assert cache.get(shuffled_cpi_data) is None
+        value = cache.set(shuffled_cpi_data, object())
+
+        assert cache.get(shuffled_cpi_data) is value
+        assert cache.get(shuffled_cpi_data.copy()) is None
+
+    def test_length_change(self, shuffled_cpi_data):
+        """Test an entry is ignored once the frame's length changes."""
+        cache = FrameCache()
+        df = shuffled_cpi_data.copy()
+        cache.set(df, 'value')
+
+        df.drop(index=df.index[:3], inplace=True)
+
+        assert cache.get(df) is None
+
+    def test_discard(self, shuffled_cpi_data):
+        """Test dropping one frame from one cache and from every cache."""
+        first = FrameCache()
+        second = FrameCache()
+        first.set(shuffled_cpi_data, 'first')
+        second.set(shuffled_cpi_data, 'second')
+
+        first.discard(shuffled_cpi_data)
+        assert first.get(shuffled_cpi_data) is None
+        assert second.get(shuffled_cpi_data) == 'second'
+
+        first.set(shuffled_cpi_data, 'first')
+        discard_frame(shuffled_cpi_data)
+        assert first.get(shuffled_cpi_data) is None
+        assert second.get(shuffled_cpi_data) is None
+
+    def test_entry_dropped_with_frame(self, shuffled_cpi_data):
+        """Test entries are removed when the frame is garbage collected."""
+        cache = FrameCache()
+        df = shuffled_cpi_data.copy()
+        cache.set(df, 'value')
+
+        del df
+        gc.collect()
+
+        assert len(cache._entries) == 0
+
+    def test_inplace_sort_rebuilds_index(self, shuffled_cpi_data):
+        """Test the cached index is rebuilt after an in-place sort (same object and length)."""
+        df = shuffled_cpi_data.copy()
+        before = get_frame_index(df)
+
+        calculate_mom_change(df, inplace=True)
+        after = get_frame_index(df)
+
+        assert after is not before
+        np.testing.assert_array_equal(after.rows(['Food']), _expected_rows(df, ['Food']))
+        assert set(take_rows(df, after.rows(['Food']))['category']) == {'Food'}
+
+    def test_inplace_edit_with_discard(self, shuffled_cpi_data):
+        """Test discard_frame() picks up in-place edits the length check cannot see."""
+        df = shuffled_cpi_data.copy()
+        get_frame_index(df)
+
+        df.loc[df['category'] == 'Food', 'category'] = 'Groceries'
+        discard_frame(df)
+
+        assert get_frame_index(df).categories == ['All-items', 'Groceries', 'Shelter']
+
+    def test_resorted_copy(self, shuffled_cpi_data):
+        """Test a frame re-sorted from a sorted, flagged one keeps its own row order."""
+        ordered = shuffled_cpi_data.sort_values(['category', 'date']).reset_index(drop=True)
+        ordered.attrs['sorted_by'] = ['category', 'date']
+        get_frame_index(ordered)
+
+        by_date = ordered.sort_values('date', kind='stable')
+        result = filter_by_category(by_date, ['Food', 'Shelter'])
+
+        expected = by_date[by_date['category'].isin(['Food', 'Shelter'])]
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class TestOneOffFilters:
+    """Test filters use a cached index but fall back to masks rather than build one."""
+
+    @pytest.mark.parametrize('select', [
+        lambda df: filter_by_category(df, ['Shelter', 'Food']),
+        lambda df: filter_by_date_range(df, '2022-06-01', '2023-03-01'),
+        lambda df: filter_by_date_range(df, None, '2022-02-01'),
+        lambda df: _filter_export_rows(df, None, '2023-01-01', None),
+        lambda df: _filter_export_rows(df, ['All-items', 'Missing'], None, '2022-12-01'),
+    ])
+    def test_mask_matches_index(self, shuffled_cpi_data, select):
+        """Test the mask and index paths select the same rows in frame order."""
+        df = shuffled_cpi_data.copy()
+
+        masked = select(df)
+        assert peek_frame_index(df) is None
+
+        get_frame_index(df)
+        indexed = select(df)
+
+        pd.testing.assert_frame_equal(masked, indexed)
+        assert masked.index.is_monotonic_increasing
@@ -16,11 +16,19 @@ from src.models.inflation import (
     calculate_mom_change,
     calculate_yoy_change,
     add_all_inflation_metrics,
+    ensure_inflation_metrics,
     get_latest_inflation_rate,
+    project_future_yoy,
+    identify_base_effect_periods,
 )
+from src.data.frame_index import discard_frame, get_frame_index
+from src.data.loader import filter_by_category
 from src.models.analysis import (
     get_recent_trends,
     get_category_breakdown,
+    calculate_inflation_percentiles,
+    get_yoy_matrix,
+    get_wide_table,
 )
 
 
@@ -45,6 +53,28 @@ def sample_cpi_data():
     return pd.DataFrame(data)
 
 
+@pytest.fixture
+def uneven_metrics_data():
+    """Create shuffled CPI data with metrics, uneven date coverage and missing values."""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='2019-01-01', end='2023-12-01', freq='MS')
+    coverage = {
+        'All-items': dates,
+        'Food': dates[6:],
+        'Energy': dates[:30],
+        'Shelter': dates.delete([20, 21, 40]),
+    }
+
+    data = []
+    for category, category_dates in coverage.items():
+        values = 100 + np.cumsum(rng.normal(0.2, 0.5, len(category_dates)))
+        data.append(pd.DataFrame({'date': category_dates, 'category': category, 'value': values}))
+
+    df = pd.concat(data, ignore_index=True).sample(frac=1, random_state=0)
+    df.loc[df.index[[4, 50, 90]], 'value'] = np.nan
+    return add_all_inflation_metrics(df)
+
+
 class TestInflationCalculations:
     """Test inflation calculation functions."""
 
@@ -92,6 +122,72 @@ class TestInflationCalculations:
         assert 'yoy_change_rolling_6m' in df.columns
         assert 'yoy_change_rolling_12m' in df.columns
 
+    def test_metric_precision(self, sample_cpi_data):
+        """Test metric storage precision."""
+        compact = add_all_inflation_metrics(sample_cpi_data)
+        full = add_all_inflation_metrics(sample_cpi_data, precision='float64')
+
+        # Metrics are stored as float32 unless full precision is requested
+        assert compact['yoy_change'].dtype == np.float32
+        assert full['yoy_change'].dtype == np.float64
+
+        # Both are computed the same way, so they agree to float32 precision
+        np.testing.assert_allclose(
+            compact['yoy_change'], full['yoy_change'], rtol=1e-6, equal_nan=True
+        )
+
+    def test_projection_precision(self, sample_cpi_data):
+        """Test projections are computed in float64 and stored in the frame's precision."""
+        # float32 values, as parsed from the StatsCan CSV, and the same values as float64
+        compact = add_all_inflation_metrics(sample_cpi_data.astype({'value': 'float32'}))
+        double = add_all_inflation_metrics(
+            sample_cpi_data.astype({'value': 'float32'}).astype({'value': 'float64'})
+        )
+
+        for assumption in ['zero', 'current', 'recent_average']:
+            projected = project_future_yoy(compact, 'Food', 6, assumption)
+            reference = project_future_yoy(double, 'Food', 6, assumption)
+
+            assert projected['value'].dtype == np.float32
+            assert projected['yoy_change'].dtype == np.float32
+
+            # The same float64 result, rounded once for storage
+            np.testing.assert_array_equal(
+                projected['value'], reference['value'].astype(np.float32)
+            )
+            np.testing.assert_array_equal(
+                projected['yoy_change'], reference['yoy_change'].astype(np.float32)
+            )
+
+    def test_ensure_metrics_reuses_result(self, sample_cpi_data):
+        """Test that metrics are computed once per source frame."""
+        first = ensure_inflation_metrics(sample_cpi_data)
+        second = ensure_inflation_metrics(sample_cpi_data)
+
+        # Same source frame should return the memoized result
+        assert first is second
+
+        # Frames that already have metrics are passed through untouched
+        assert ensure_inflation_metrics(first) is first
+
+    def test_ensure_metrics_recomputes_after_discard(self):
+        """Test that discarding an edited source frame recomputes its metrics."""
+        df = pd.DataFrame({
+            'date': pd.date_range('2023-01-01', periods=3, freq='MS'),
+            'category': 'All-items',
+            'value': [100.0, 200.0, 300.0],
+        })
+        first = ensure_inflation_metrics(df)
+        np.testing.assert_allclose(first['mom_change'], [np.nan, 100, 50], equal_nan=True)
+
+        # In-place edits keep the frame's identity and length, so callers discard it
+        df.loc[2, 'value'] = 600.0
+        discard_frame(df)
+        second = ensure_inflation_metrics(df)
+
+        assert second is not first
+        np.testing.assert_allclose(second['mom_change'], [np.nan, 100, 200], equal_nan=True)
+
     def test_latest_inflation_rate(self, sample_cpi_data):
         """Test getting latest inflation rate."""
         df = add_all_inflation_metrics(sample_cpi_data)
@@ -136,6 +232,162 @@ class TestAnalysisFunctions:
                   for i in range(len(breakdown)-1))
 
 
+def _project_with_pandas(df, category, months_ahead, mom_assumption):
+    """The original project_future_yoy, matching lookback rows by date, for comparison."""
+    cat_data = df[df['category'] == category].copy()
+    cat_data = cat_data.sort_values('date')
+
+    latest = cat_data.iloc[-1]
+    latest_date = latest['date']
+    latest_value = latest['value']
+
+    if mom_assumption == "zero":
+        mom_rate = 0.0
+    elif mom_assumption == "current":
+        mom_rate = latest.get('mom_change', 0) / 100
+    else:
+        mom_rate = cat_data.tail(3)['mom_change'].mean() / 100
+
+    projections = []
+    current_value = latest_value
+    for i in range(1, months_ahead + 1):
+        current_value = current_value * (1 + mom_rate)
+        future_date = latest_date + pd.DateOffset(months=i)
+
+        lookback_date = future_date - pd.DateOffset(months=12)
+        value_12m_ago_row = cat_data[cat_data['date'] == lookback_date]
+
+        if len(value_12m_ago_row) > 0:
+            value_12m_ago = value_12m_ago_row.iloc[0]['value']
+            projections.append({
+                'date': future_date,
+                'category': category,
+                'value': current_value,
+                'yoy_change': ((current_value / value_12m_ago) - 1) * 100,
+                'is_projection': True,
+                'assumption': mom_assumption
+            })
+
+    return pd.DataFrame(projections)
+
+
+class TestProjections:
+    """Test projections and base effect periods against the original implementations."""
+
+    @pytest.mark.parametrize('category', ['All-items', 'Food', 'Shelter', 'Energy'])
+    @pytest.mark.parametrize('mom_assumption', ['zero', 'current', 'recent_average'])
+    def test_projection_matches_row_matching(self, uneven_metrics_data, category, mom_assumption):
+        """Test projected dates and values, with gaps inside the 12-month lookback."""
+        raw = uneven_metrics_data[['date', 'category', 'value']]
+        gaps = raw['date'].isin(pd.to_datetime(['2023-03-01', '2023-08-01']))
+        raw = raw[~(gaps & (raw['category'] == 'Food'))]
+
+        result = project_future_yoy(add_all_inflation_metrics(raw), category, 15, mom_assumption)
+
+        # The original ran on float64 metrics; float32 storage only rounds the result
+        full = add_all_inflation_metrics(raw, precision='float64')
+        expected = _project_with_pandas(full, category, 15, mom_assumption)
+
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, rtol=1e-6, atol=1e-5)
+
+
+    @pytest.mark.parametrize('category', ['All-items', 'Shelter', 'Missing'])
+    @pytest.mark.parametrize('yoy_threshold,mom_threshold', [(0.5, 0.2), (0.2, 0.6), (0.0, 10.0)])
+    def test_base_effects_match_diff(
+        self, uneven_metrics_data, category, yoy_threshold, mom_threshold
+    ):
+        """Test flagged periods match the original diff() and abs() masks on gappy data."""
+        df = uneven_metrics_data
+
+        cat_data = df[df['category'] == category].copy()
+        cat_data = cat_data.sort_values('date')
+        cat_data['yoy_change_delta'] = cat_data['yoy_change'].diff()
+        cat_data['is_base_effect'] = (
+            (abs(cat_data['yoy_change_delta']) > yoy_threshold) &
+            (abs(cat_data['mom_change']) < mom_threshold)
+        )
+        expected = cat_data[cat_data['is_base_effect']]
+
+        result = identify_base_effect_periods(df, category, yoy_threshold, mom_threshold)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class TestPercentiles:
+    """Test percentile lookups against the original per-category comparison."""
+
+    @pytest.mark.parametrize('date', [None, '2020-03-01', '2022-06-01', '2019-06-01'])
+    def test_percentiles_match_comparison(self, uneven_metrics_data, date):
+        """Test the share of categories with strictly lower YoY, with ties and absent categories."""
+        raw = uneven_metrics_data[['date', 'category', 'value']]
+        twin = raw[raw['category'] == 'Food'].assign(category='Food twin')
+        df = add_all_inflation_metrics(pd.concat([raw, twin], ignore_index=True))
+        categories = ['All-items', 'Food', 'Food twin', 'Energy', 'Shelter', 'Missing']
+
+        target = df['date'].max() if date is None else pd.Timestamp(date)
+        snapshot = df[(df['date'] == target) & df['yoy_change'].notna()]
+        expected = {}
+        for category in categories:
+            if category not in snapshot['category'].values:
+                expected[category] = np.nan
+                continue
+            cat_inflation = snapshot[snapshot['category'] == category]['yoy_change'].values[0]
+            all_inflation = snapshot['yoy_change'].values
+            expected[category] = (all_inflation < cat_inflation).sum() / len(all_inflation) * 100
+
+        result = calculate_inflation_percentiles(df, categories, date)
+
+        assert list(result) == categories
+        np.testing.assert_array_equal(list(result.values()), list(expected.values()))
+
+
+class TestWideFormats:
+    """Test wide and matrix views against the pandas pivots they replace."""
+
+    @pytest.mark.parametrize('start_date', [None, '2021-03-01', '2023-06-01'])
+    def test_yoy_matrix_matches_pivot(self, uneven_metrics_data, start_date):
+        """Test get_yoy_matrix matches pivot().reindex(), including absent categories."""
+        df = uneven_metrics_data
+        categories = ['Shelter', 'Missing', 'All-items', 'Energy']
+
+        recent = df[df['category'].isin(categories)]
+        if start_date is not None:
+            recent = recent[recent['date'] >= pd.Timestamp(start_date)]
+        expected = (
+            recent.assign(category=recent['category'].astype(str))
+            .pivot(index='category', columns='date', values='yoy_change')
+            .reindex(categories)
+        )
+
+        matrix, months = get_yoy_matrix(df, categories, start_date)
+
+        np.testing.assert_array_equal(matrix, expected.to_numpy())
+        pd.testing.assert_index_equal(months, expected.columns, exact=False, check_names=False)
+
+    @pytest.mark.parametrize('value_col', ['value', 'yoy_change'])
+    @pytest.mark.parametrize('start_date,end_date', [
+        (None, None),
+        ('2021-03-01', None),
+        (None, '2020-12-01'),
+        ('2022-01-01', '2022-12-01'),
+        ('2023-06-01', '2021-01-01'),
+    ])
+    def test_wide_table_matches_pivot(self, uneven_metrics_data, value_col, start_date, end_date):
+        """Test get_wide_table matches pivoting the rows in the date range."""
+        df = uneven_metrics_data
+
+        in_range = df
+        if start_date is not None:
+            in_range = in_range[in_range['date'] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            in_range = in_range[in_range['date'] <= pd.Timestamp(end_date)]
+        expected = in_range.pivot(index='category', columns='date', values=value_col)
+
+        result = get_wide_table(df, value_col, start_date, end_date)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+
 class TestDataValidation:
     """Test data validation and edge cases."""
 
@@ -165,3 +417,52 @@ class TestDataValidation:
 
         # Should handle NaN gracefully
         assert 'yoy_change' in result.columns
+
+    def test_missing_values_not_forward_filled(self, sample_cpi_data):
+        """Test that changes across a missing value stay missing."""
+        df = sample_cpi_data.copy()
+        df.loc[5, 'value'] = np.nan
+
+        result = calculate_mom_change(df)
+
+        # The month after the gap has no previous value to compare against
+        assert pd.isna(result.loc[5, 'mom_change'])
+        assert pd.isna(result.loc[6, 'mom_change'])
+        assert pd.notna(result.loc[7, 'mom_change'])
+
+    def test_resorted_frame_not_treated_as_sorted(self, sample_cpi_data):
+        """Test that a frame re-sorted by date is put back in category order."""
+        # attrs are copied onto derived frames, so a stale order flag survives the re-sort
+        df = sample_cpi_data.copy()
+        df.attrs['sorted_by'] = ['category', 'date']
+        by_date = df.sort_values('date', kind='stable')
+
+        result = add_all_inflation_metrics(by_date)
+        expected = add_all_inflation_metrics(sample_cpi_data)
+
+        np.testing.assert_allclose(
+            result.sort_index()['mom_change'], expected.sort_index()['mom_change'],
+            equal_nan=True
+        )
+        assert result['yoy_change'].notna().any()
+
+        # Filtering keeps the frame's own (date) row order
+        filtered = filter_by_category(by_date, ['Food', 'Shelter'])
+        assert filtered['date'].is_monotonic_increasing
+        assert list(filtered.index) == [
+            i for i in by_date.index if by_date.loc[i, 'category'] in ('Food', 'Shelter')
+        ]
+
+    def test_inplace_sort_drops_cached_index(self, sample_cpi_data):
+        """Test that sorting a frame in place does not leave a stale row index."""
+        df = sample_cpi_data.sort_values('date', kind='stable')
+
+        # Build and cache the row index for the date-ordered frame
+        get_frame_index(df)
+        filter_by_category(df, ['Food'])
+
+        calculate_mom_change(df, inplace=True)
+        filtered = filter_by_category(df, ['Food'])
+
+        assert set(filtered['category']) == {'Food'}
+        assert len(filtered) == (sample_cpi_data['category'] == 'Food').sum()
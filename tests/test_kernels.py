@@ -0,0 +1,135 @@
+"""
+Unit tests for the grouped array kernels
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.kernels import (
+    group_starts,
+    group_positions,
+    grouped_shift,
+    grouped_diff,
+    grouped_pct_change,
+    grouped_rolling_mean,
+)
+
+
+@pytest.fixture
+def gappy_cpi_data():
+    """Create shuffled CPI data with missing months, NaN, inf and zero values."""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='2020-01-01', periods=30, freq='MS')
+
+    data = []
+    for category in ['Shelter', 'All-items', 'Food']:
+        # Drop some months so consecutive rows are not always one month apart
+        for i in np.sort(rng.choice(len(dates), 22, replace=False)):
+            data.append({
+                'date': dates[i],
+                'category': category,
+                'value': rng.uniform(90, 110)
+            })
+
+    df = pd.DataFrame(data).sample(frac=1, random_state=1)
+    df.loc[df.index[[3, 10, 20]], 'value'] = np.nan
+    df.loc[df.index[5], 'value'] = np.inf
+    df.loc[df.index[7], 'value'] = -np.inf
+    df.loc[df.index[8], 'value'] = 0.0
+    return df
+
+
+def _kernel_inputs(df):
+    """Sort by (category, date) and get the values and within-category positions."""
+    ordered = df.sort_values(['category', 'date'], kind='stable')
+    codes, _ = pd.factorize(ordered['category'])
+    positions = group_positions(group_starts(codes), len(ordered))
+    return ordered, ordered['value'].to_numpy(), positions
+
+
+def _by_date(df):
+    """Order rows by date only, leaving categories interleaved, for the groupby reference."""
+    return df.sort_values('date', kind='stable')
+
+
+class TestGroupPositions:
+    """Test segment start and position helpers."""
+
+    def test_positions(self):
+        """Test positions restart at 0 for each group."""
+        codes = np.array([0, 0, 0, 1, 2, 2])
+
+        starts = group_starts(codes)
+
+        np.testing.assert_array_equal(starts, [0, 3, 4])
+        np.testing.assert_array_equal(group_positions(starts, len(codes)), [0, 1, 2, 0, 0, 1])
+
+    def test_empty(self):
+        """Test empty input."""
+        starts = group_starts(np.array([], dtype=np.int64))
+
+        assert len(starts) == 0
+        assert len(group_positions(starts, 0)) == 0
+
+
+class TestGroupedKernels:
+    """Test kernels against the equivalent pandas groupby operations."""
+
+    @pytest.mark.parametrize('periods', [1, 12, 40])
+    def test_shift(self, gappy_cpi_data, periods):
+        """Test grouped shift matches groupby().shift()."""
+        ordered, values, positions = _kernel_inputs(gappy_cpi_data)
+
+        expected = _by_date(gappy_cpi_data).groupby('category')['value'].shift(periods)
+
+        np.testing.assert_array_equal(
+            grouped_shift(values, positions, periods), expected.loc[ordered.index]
+        )
+
+    @pytest.mark.parametrize('periods', [1, 12])
+    def test_diff(self, gappy_cpi_data, periods):
+        """Test grouped diff matches groupby().diff()."""
+        ordered, values, positions = _kernel_inputs(gappy_cpi_data)
+
+        expected = _by_date(gappy_cpi_data).groupby('category')['value'].diff(periods)
+
+        np.testing.assert_array_equal(
+            grouped_diff(values, positions, periods), expected.loc[ordered.index]
+        )
+
+    @pytest.mark.parametrize('periods', [1, 12])
+    def test_pct_change(self, gappy_cpi_data, periods):
+        """Test grouped pct_change matches groupby().pct_change() without filling."""
+        ordered, values, positions = _kernel_inputs(gappy_cpi_data)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            expected = _by_date(gappy_cpi_data).groupby('category')['value'].pct_change(
+                periods, fill_method=None
+            )
+
+        # Changes from a zero value are +/-inf in both
+        np.testing.assert_array_equal(
+            grouped_pct_change(values, positions, periods), expected.loc[ordered.index]
+        )
+
+    @pytest.mark.parametrize('window', [1, 3, 12])
+    def test_rolling_mean(self, gappy_cpi_data, window):
+        """Test grouped rolling mean matches groupby().rolling(min_periods=1).mean()."""
+        ordered, values, positions = _kernel_inputs(gappy_cpi_data)
+
+        expected = (
+            _by_date(gappy_cpi_data).groupby('category')['value']
+            .rolling(window, min_periods=1).mean()
+            .reset_index(level=0, drop=True)
+        )
+
+        np.testing.assert_allclose(
+            grouped_rolling_mean(values, positions, window), expected.loc[ordered.index],
+            rtol=1e-12, equal_nan=True
+        )